@@ -5,21 +5,81 @@ Handles data collection from Instagram, Facebook, and Google Maps via BrightData
 
 import httpx
 import asyncio
-from typing import Dict, Optional, List, Any
+import json
+from typing import AsyncIterator, Callable, Dict, Optional, List, Any
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import os
 
+from http_clients import create_http_client
+from review_stats import ReviewSeries, review_aggregates
+
+
+DEFAULT_BASE_URL = "https://api.brightdata.com/datasets/v3"
+
+
+class SnapshotNotReady(Exception):
+    """Raised when a snapshot is requested before BrightData finished building it"""
+
+
 class BrightDataClient:
     """Client for interacting with BrightData API"""
     
-    def __init__(self, api_token: str):
+    def __init__(
+        self,
+        api_token: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        notify_url: Optional[str] = None,
+        notify_auth: Optional[str] = None,
+        stream_snapshots: bool = False,
+        observer: Optional[Callable[[httpx.Request, Optional[int], float], None]] = None,
+        base_url: Optional[str] = None
+    ):
+        """
+        Args:
+            api_token: BrightData API token
+            http_client: Shared AsyncClient to reuse across calls. When omitted the
+                client lazily creates (and owns) its own pooled connection.
+            notify_url: Webhook BrightData calls when a snapshot is ready
+            notify_auth: Authorization header value sent with the notification
+            stream_snapshots: Download snapshots as NDJSON and parse them incrementally
+            observer: Passed to create_http_client for the client this instance creates
+            base_url: Datasets API root; defaults to BRIGHTDATA_BASE_URL, then to
+                BrightData's. Point it at tools/brightdata_sim.py to test offline.
+        """
         self.api_token = api_token
-        self.base_url = "https://api.brightdata.com/datasets/v3"
+        self.base_url = (base_url or os.environ.get("BRIGHTDATA_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.notify_url = notify_url
+        self.notify_auth = notify_auth
+        self.stream_snapshots = stream_snapshots
+        self.observer = observer
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
         self.dataset_ids = {
             "instagram": "gd_l7q7dkf244hwjntr0",  # Instagram dataset
             "facebook": "gd_lvhf8tq8ky28b3tbz",    # Facebook dataset  
             "googlemaps": "gd_l7q7dkf244hwjku40"   # Google Maps dataset
         }
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Pooled client used for every API call (keep-alive across requests)"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = create_http_client("brightdata", observer=self.observer)
+            self._owns_http_client = True
+        return self._http_client
+    
+    async def aclose(self):
+        """Close the underlying HTTP client if this instance created it"""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
         
     async def trigger_crawl(self, platform: str, urls: List[str], params: Optional[Dict] = None) -> Dict:
         """
@@ -33,11 +93,6 @@ class BrightDataClient:
         Returns:
             Dict with job_id and status
         """
-        if platform not in self.dataset_ids:
-            raise ValueError(f"Unsupported platform: {platform}. Must be one of {list(self.dataset_ids.keys())}")
-        
-        dataset_id = self.dataset_ids[platform]
-        
         # Prepare payload based on platform
         payload = []
         for url in urls:
@@ -46,29 +101,53 @@ class BrightDataClient:
                 entry.update(params)
             payload.append(entry)
         
+        return await self.trigger_batch(platform, payload)
+    
+    async def trigger_batch(self, platform: str, entries: List[Dict]) -> Dict:
+        """
+        Trigger one crawl job for several inputs of the same dataset
+        
+        Args:
+            platform: One of 'instagram', 'facebook', 'googlemaps'
+            entries: Input records, each with a 'url' and its own parameters
+            
+        Returns:
+            Dict with the shared job_id (snapshot_id) and status
+        """
+        if platform not in self.dataset_ids:
+            raise ValueError(f"Unsupported platform: {platform}. Must be one of {list(self.dataset_ids.keys())}")
+        
+        dataset_id = self.dataset_ids[platform]
+        urls = [entry["url"] for entry in entries]
+        
+        query = {"dataset_id": dataset_id}
+        if self.notify_url:
+            query["notify"] = self.notify_url
+            if self.notify_auth:
+                query["auth_header"] = self.notify_auth
+        
         headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/trigger",
-                    params={"dataset_id": dataset_id},
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                return {
-                    "job_id": data.get("snapshot_id"),
-                    "status": "running",
-                    "platform": platform,
-                    "urls": urls,
-                    "created_at": datetime.utcnow().isoformat()
-                }
+            response = await self.http_client.post(
+                f"{self.base_url}/trigger",
+                params=query,
+                json=entries,
+                headers=headers
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            return {
+                "job_id": data.get("snapshot_id"),
+                "status": "running",
+                "platform": platform,
+                "urls": urls,
+                "created_at": datetime.utcnow().isoformat()
+            }
         except httpx.HTTPStatusError as e:
             return {
                 "error": f"HTTP error {e.response.status_code}: {e.response.text}",
@@ -95,20 +174,19 @@ class BrightDataClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/progress/{job_id}",
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                return {
-                    "job_id": job_id,
-                    "status": data.get("status", "unknown"),
-                    "progress": data.get("progress", 0),
-                    "total_records": data.get("total_records", 0)
-                }
+            response = await self.http_client.get(
+                f"{self.base_url}/progress/{job_id}",
+                headers=headers
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            return {
+                "job_id": job_id,
+                "status": data.get("status", "unknown"),
+                "progress": data.get("progress", 0),
+                "total_records": data.get("total_records", 0)
+            }
         except Exception as e:
             return {
                 "job_id": job_id,
@@ -116,36 +194,70 @@ class BrightDataClient:
                 "error": str(e)
             }
     
-    async def get_results(self, job_id: str) -> Dict:
+    async def get_results(
+        self,
+        job_id: str,
+        platform: Optional[str] = None,
+        urls: Optional[List[str]] = None,
+        stream: Optional[bool] = None
+    ) -> Dict:
         """
         Retrieve results from a completed crawl job
         
         Args:
             job_id: The snapshot_id returned from trigger_crawl
+            platform: Platform of the snapshot; when streaming, only the records
+                its parser needs are kept and the download stops early
+            urls: Input URLs of the snapshot, used to stop once each one is covered
+            stream: Download as NDJSON and parse incrementally (defaults to
+                the client's stream_snapshots setting)
             
         Returns:
             Dict with crawled data
         """
+        if stream is None:
+            stream = self.stream_snapshots
+        
         headers = {
             "Authorization": f"Bearer {self.api_token}"
         }
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(
+            reviews = None
+            if stream:
+                collector = SnapshotCollector(
+                    urls, PARSER_RECORD_LIMITS.get(platform), fold_reviews=platform in REVIEW_PLATFORMS
+                )
+                async for record in self.iter_results(job_id):
+                    if collector.feed(record):
+                        break  # Closes the stream; the rest of the snapshot is never downloaded
+                data = collector.records
+                reviews = collector.reviews if collector.fold_reviews else None
+            else:
+                response = await self.http_client.get(
                     f"{self.base_url}/snapshot/{job_id}",
                     params={"format": "json"},
-                    headers=headers
+                    headers=headers,
+                    timeout=60.0
                 )
                 response.raise_for_status()
+                if response.status_code == 202:
+                    raise SnapshotNotReady(job_id)
                 data = response.json()
-                
-                return {
-                    "job_id": job_id,
-                    "status": "completed",
-                    "data": data,
-                    "retrieved_at": datetime.utcnow().isoformat()
-                }
+            
+            return {
+                "job_id": job_id,
+                "status": "completed",
+                "data": data,
+                "reviews": reviews,
+                "retrieved_at": datetime.utcnow().isoformat()
+            }
+        except SnapshotNotReady:
+            return {
+                "job_id": job_id,
+                "status": "not_found",
+                "error": "Job not found or not yet completed"
+            }
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return {
@@ -165,14 +277,54 @@ class BrightDataClient:
                 "error": str(e)
             }
     
-    async def wait_for_completion(self, job_id: str, max_wait: int = 300, poll_interval: int = 10) -> Dict:
+    async def iter_results(self, job_id: str) -> AsyncIterator[Dict]:
+        """
+        Stream the records of a snapshot one at a time (NDJSON download)
+        
+        Memory use is bounded by a single record; leaving the loop early closes
+        the connection.
+        
+        Raises:
+            SnapshotNotReady: The snapshot is still being built
+            httpx.HTTPStatusError: BrightData answered with an error status
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_token}"
+        }
+        
+        async with self.http_client.stream(
+            "GET",
+            f"{self.base_url}/snapshot/{job_id}",
+            params={"format": "ndjson"},
+            headers=headers,
+            timeout=60.0
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                response.raise_for_status()
+            if response.status_code == 202:
+                raise SnapshotNotReady(job_id)
+            
+            async for line in response.aiter_lines():
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    
+    async def wait_for_completion(
+        self,
+        job_id: str,
+        max_wait: int = 300,
+        poll_interval: int = 2,
+        max_poll_interval: int = 30
+    ) -> Dict:
         """
         Wait for a job to complete and return results
         
         Args:
             job_id: The snapshot_id to wait for
             max_wait: Maximum wait time in seconds
-            poll_interval: How often to check status in seconds
+            poll_interval: Initial delay between status checks in seconds
+            max_poll_interval: Upper bound for the doubling delay between checks
             
         Returns:
             Dict with final results or error
@@ -187,8 +339,10 @@ class BrightDataClient:
             elif status.get("status") in ["failed", "error"]:
                 return status
             
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
+            delay = min(poll_interval, max_wait - elapsed)
+            await asyncio.sleep(delay)
+            elapsed += delay
+            poll_interval = min(poll_interval * 2, max_poll_interval)
         
         return {
             "job_id": job_id,
@@ -197,6 +351,100 @@ class BrightDataClient:
         }
 
 
+def normalize_url(url: str) -> str:
+    """Canonical form of a profile URL, used to match snapshot records and deduplicate crawls"""
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query) if not key.startswith("utm_")
+    ))
+    return urlunsplit(("https", netloc, parts.path.rstrip("/"), query, ""))
+
+
+def records_for_url(raw_data: List[Dict], url: Optional[str]) -> List[Dict]:
+    """
+    Select the snapshot records produced for one input URL
+    
+    Batched snapshots contain records for several inputs; BrightData echoes the
+    input in each record. Snapshots without input echoes are returned unchanged.
+    """
+    if not url or not raw_data or not any(isinstance(r, dict) and r.get("input") for r in raw_data):
+        return raw_data
+    
+    wanted = normalize_url(url)
+    return [
+        record for record in raw_data
+        if normalize_url((record.get("input") or {}).get("url", "")) == wanted
+    ]
+
+
+class SnapshotCollector:
+    """
+    Bounded consumer for streamed snapshot records
+    
+    Keeps at most `per_url_limit` records per input URL and reports when every
+    expected URL has all the records its parser needs. With fold_reviews, every
+    record's rating and date are also folded into a per-URL ReviewSeries, so
+    review snapshots are read to the end without holding their rows.
+    """
+    
+    def __init__(
+        self,
+        urls: Optional[List[str]] = None,
+        per_url_limit: Optional[int] = None,
+        fold_reviews: bool = False
+    ):
+        self.expected = {normalize_url(url) for url in urls or []}
+        self.per_url_limit = per_url_limit
+        self.fold_reviews = fold_reviews
+        self.records: List[Dict] = []
+        self.reviews: Dict[Optional[str], ReviewSeries] = {}
+        self._counts: Dict[Optional[str], int] = {}
+    
+    def feed(self, record: Dict) -> bool:
+        """Add one record; returns True once no further records are needed"""
+        key = input_url_key(record)
+        if self.fold_reviews:
+            self.reviews.setdefault(key, ReviewSeries()).add(record)
+        
+        count = self._counts.get(key, 0)
+        if self.per_url_limit is None or count < self.per_url_limit:
+            self._counts[key] = count + 1
+            self.records.append(record)
+        return self.is_complete()
+    
+    def is_complete(self) -> bool:
+        if self.per_url_limit is None or self.fold_reviews:
+            return False
+        if None in self._counts and len(self.expected) <= 1:
+            # Records without input echo: single-URL snapshot
+            return self._counts[None] >= self.per_url_limit
+        return bool(self.expected) and all(
+            self._counts.get(url, 0) >= self.per_url_limit for url in self.expected
+        )
+
+
+def input_url_key(record: Dict) -> Optional[str]:
+    """Normalized input URL echoed by a snapshot record; None without an echo"""
+    echoed = record.get("input") if isinstance(record, dict) else None
+    return normalize_url(echoed["url"]) if isinstance(echoed, dict) and echoed.get("url") else None
+
+
+def group_records_by_url(raw_data: List[Dict]) -> Dict[Optional[str], List[Dict]]:
+    """
+    Split a (possibly batched) snapshot into the records of each input URL
+    
+    Keys are normalized input URLs; records without an input echo are grouped
+    under None, as in a single-URL snapshot.
+    """
+    groups: Dict[Optional[str], List[Dict]] = {}
+    for record in raw_data or []:
+        groups.setdefault(input_url_key(record), []).append(record)
+    return groups
+
+
 def parse_instagram_data(raw_data: List[Dict]) -> Dict:
     """Parse Instagram crawl results"""
     if not raw_data or len(raw_data) == 0:
@@ -211,31 +459,43 @@ def parse_instagram_data(raw_data: List[Dict]) -> Dict:
     }
 
 
-def parse_facebook_data(raw_data: List[Dict]) -> Dict:
-    """Parse Facebook crawl results"""
+def parse_facebook_data(raw_data: List[Dict], reviews: Optional[ReviewSeries] = None) -> Dict:
+    """
+    Parse Facebook crawl results; page fields from the first record, satisfaction
+    over all reviews (the streamed ReviewSeries, or every record when not given)
+    """
     if not raw_data or len(raw_data) == 0:
         return {"fans": 0, "reviews_count": 0, "rating": 0, "error": "No data returned"}
     
     item = raw_data[0]
+    if reviews is None:
+        reviews = ReviewSeries.from_records(raw_data)
     return {
         "fans": item.get("fans_count", 0),
         "reviews_count": item.get("reviews_count", 0),
         "rating": item.get("rating", 0),
-        "page_name": item.get("name", "")
+        "page_name": item.get("name", ""),
+        "satisfaction": review_aggregates(reviews)
     }
 
 
-def parse_googlemaps_data(raw_data: List[Dict]) -> Dict:
-    """Parse Google Maps crawl results"""
+def parse_googlemaps_data(raw_data: List[Dict], reviews: Optional[ReviewSeries] = None) -> Dict:
+    """
+    Parse Google Maps crawl results; place fields from the first record, satisfaction
+    over all reviews (the streamed ReviewSeries, or every record when not given)
+    """
     if not raw_data or len(raw_data) == 0:
         return {"reviews_count": 0, "rating": 0, "error": "No data returned"}
     
     item = raw_data[0]
+    if reviews is None:
+        reviews = ReviewSeries.from_records(raw_data)
     return {
         "reviews_count": item.get("reviews_count", 0),
         "rating": item.get("rating", 0),
         "place_name": item.get("name", ""),
-        "address": item.get("address", "")
+        "address": item.get("address", ""),
+        "satisfaction": review_aggregates(reviews)
     }
 
 
@@ -246,13 +506,68 @@ PARSERS = {
     "googlemaps": parse_googlemaps_data
 }
 
+# Records per input URL each parser reads (None = all); bounds streamed downloads
+PARSER_RECORD_LIMITS = {
+    "instagram": 1,
+    "facebook": 1,
+    "googlemaps": 1
+}
+
+# Platforms whose snapshots hold one row per review; streamed rows are folded into a ReviewSeries
+REVIEW_PLATFORMS = frozenset({"facebook", "googlemaps"})
+
+
+def parse_snapshot(
+    platform: str,
+    raw_data: List[Dict],
+    reviews: Optional[Dict[Optional[str], ReviewSeries]] = None
+) -> Dict[Optional[str], Any]:
+    """
+    Parse every input of a snapshot in one pass
+    
+    Args:
+        platform: Platform of the snapshot
+        raw_data: Snapshot records (for streamed review snapshots, only the first per URL)
+        reviews: ReviewSeries per normalized input URL folded while streaming
+    
+    Returns:
+        Dict mapping normalized input URL (None for records without an input
+        echo) to the parsed results for that URL
+    """
+    parser = PARSERS.get(platform)
+    if not parser:
+        return group_records_by_url(raw_data)
+    if reviews is None:
+        return {url: parser(records) for url, records in group_records_by_url(raw_data).items()}
+    return {
+        url: parser(records, reviews.get(url, ReviewSeries()))
+        for url, records in group_records_by_url(raw_data).items()
+    }
+
+
+def results_for_url(parsed: Dict[Optional[str], Any], platform: str, url: Optional[str]) -> Any:
+    """
+    Pick one input's results out of parse_snapshot() output
+    
+    Snapshots without input echoes hold a single None group, used for any URL;
+    a URL missing from the snapshot gets the parser's empty result.
+    """
+    key = normalize_url(url) if url else None
+    if key in parsed:
+        return parsed[key]
+    if None in parsed and len(parsed) == 1:
+        return parsed[None]
+    parser = PARSERS.get(platform)
+    return parser([]) if parser else []
+
 
 async def get_social_data_via_brightdata(
     platform: str,
     url: str,
     api_token: str,
     params: Optional[Dict] = None,
-    wait_for_results: bool = False
+    wait_for_results: bool = False,
+    client: Optional[BrightDataClient] = None
 ) -> Dict:
     """
     High-level function to get social data via BrightData
@@ -263,11 +578,16 @@ async def get_social_data_via_brightdata(
         api_token: BrightData API token
         params: Platform-specific parameters
         wait_for_results: If True, wait for job completion and return data
+        client: Shared BrightDataClient; a short-lived one is created if omitted
         
     Returns:
         Dict with either job_id (if not waiting) or parsed data (if waiting)
     """
-    client = BrightDataClient(api_token)
+    if client is None:
+        async with BrightDataClient(api_token) as owned_client:
+            return await get_social_data_via_brightdata(
+                platform, url, api_token, params, wait_for_results, client=owned_client
+            )
     
     # Trigger the crawl
     trigger_result = await client.trigger_crawl(platform, [url], params)
@@ -295,7 +615,7 @@ async def get_social_data_via_brightdata(
     parser = PARSERS.get(platform)
     
     if parser:
-        parsed = parser(raw_data)
+        parsed = parser(records_for_url(raw_data, url))
         return {
             "status": "success",
             "platform": platform,
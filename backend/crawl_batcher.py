@@ -0,0 +1,123 @@
+"""
+Crawl Batcher for Look@Me CMS
+Collects crawl requests from all tenants for a short window and sends
+one BrightData trigger call per dataset
+"""
+
+import asyncio
+import json
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from brightdata_integration import BrightDataClient
+
+
+class CrawlBatcher:
+    """
+    Coalesces per-URL crawl requests into batched trigger calls
+
+    Every caller waits for the batch its request landed in and receives the
+    shared snapshot id; results are fanned back out per URL when the snapshot
+    completes (see records_for_url).
+    """
+
+    def __init__(
+        self,
+        get_client: Callable[[], BrightDataClient],
+        window: float = 2.0,
+        max_batch: int = 1000
+    ):
+        """
+        Args:
+            get_client: Returns the (shared) BrightDataClient used to trigger batches
+            window: Seconds to wait for more requests before triggering a batch
+            max_batch: Trigger immediately once this many requests are pending
+        """
+        self.get_client = get_client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[Tuple[Dict, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._flushing: Set[asyncio.Task] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of crawl requests waiting for their batch to be triggered"""
+        return sum(len(batch) for batch in self._pending.values())
+
+    async def submit(self, platform: str, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Queue a crawl for the next batch of its platform
+
+        Returns:
+            Same shape as get_social_data_via_brightdata: status 'job_created'
+            with the batch job_id, or the trigger error
+        """
+        entry = {"url": url}
+        if params:
+            entry.update(params)
+
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(platform, [])
+        batch.append((entry, future))
+
+        if len(batch) >= self.max_batch:
+            timer = self._timers.pop(platform, None)
+            if timer:
+                timer.cancel()
+            self._spawn_flush(platform)
+        elif platform not in self._timers:
+            self._timers[platform] = asyncio.create_task(self._flush_later(platform))
+
+        result = await future
+        if result.get("status") == "failed":
+            return result
+        return {
+            "status": "job_created",
+            "job_id": result["job_id"],
+            "message": f"Crawl job created for {platform}. Check status with job_id."
+        }
+
+    async def close(self):
+        """Drop pending requests without triggering them and wait for in-flight batches (shutdown)"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for batch in self._pending.values():
+            for _, future in batch:
+                future.cancel()
+        self._pending.clear()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    async def _flush_later(self, platform: str):
+        await asyncio.sleep(self.window)
+        task = self._timers.pop(platform, None)
+        if task:
+            # Keep a reference while the trigger call is in flight
+            self._flushing.add(task)
+            task.add_done_callback(self._flushing.discard)
+        await self._flush(platform)
+
+    def _spawn_flush(self, platform: str):
+        task = asyncio.create_task(self._flush(platform))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _flush(self, platform: str):
+        batch = self._pending.pop(platform, [])
+        if not batch:
+            return
+
+        # Several tenants may ask for the same URL with the same parameters
+        entries = {}
+        for entry, _ in batch:
+            entries.setdefault(json.dumps(entry, sort_keys=True), entry)
+
+        try:
+            result = await self.get_client().trigger_batch(platform, list(entries.values()))
+        except Exception as e:
+            result = {"error": str(e), "status": "failed"}
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,121 @@
+"""
+Display Update Broker for Look@Me CMS
+Pushes new display snapshots to subscribed storefront screens, for changes made
+by this worker and, through polling of display_snapshots, by any other worker
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from display_cache import is_current_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class DisplayBroker:
+    """
+    Per-worker fan-out of display snapshots to subscriber queues
+
+    A subscriber only ever needs the newest snapshot, so each queue holds at
+    most one and a newer snapshot replaces an unread one. Idle subscribers cost
+    a queue each; a single poll per interval covers every subscribed user.
+    """
+
+    def __init__(self, collection, cache=None, poll_interval: float = 2.0):
+        """
+        Args:
+            collection: Motor collection holding the display snapshots
+            cache: DisplaySnapshotCache refreshed with snapshots found by polling,
+                so this worker's reads agree with what was pushed
+            poll_interval: Seconds between checks for snapshots rebuilt by other
+                workers; 0 disables polling (single-worker deployments)
+        """
+        self.collection = collection
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._versions: Dict[str, str] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, user_id: str, version: Optional[str] = None) -> asyncio.Queue:
+        """
+        Register a subscriber for a user's display
+
+        Args:
+            version: Etag the subscriber already has; used to seed change
+                detection when this worker has not seen the user yet
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        if version is not None:
+            self._versions.setdefault(user_id, version)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+            self._versions.pop(user_id, None)
+
+    def publish(self, user_id: str, snapshot: Optional[Dict]):
+        """
+        Deliver a snapshot to every subscriber of its user
+
+        None ends the subscriptions (used on shutdown). Snapshots whose etag
+        subscribers already have are not sent again.
+        """
+        if snapshot is not None:
+            if self._versions.get(user_id) == snapshot["etag"]:
+                return
+            if user_id in self._subscribers:
+                self._versions[user_id] = snapshot["etag"]
+
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()  # Superseded before it was read
+            queue.put_nowait(snapshot)
+
+    def close(self):
+        """End every open subscription"""
+        for user_id in list(self._subscribers):
+            self.publish(user_id, None)
+
+    async def poll_once(self):
+        """Publish snapshots of subscribed users that changed since they were last seen"""
+        user_ids = list(self._subscribers)
+        if not user_ids:
+            return
+
+        changed = []
+        async for doc in self.collection.find(
+            {"user_id": {"$in": user_ids}}, {"_id": 0, "user_id": 1, "etag": 1, "schema_version": 1}
+        ):
+            # Snapshots written by a worker running an older payload layout are not pushed
+            if is_current_snapshot(doc) and self._versions.get(doc["user_id"]) != doc["etag"]:
+                changed.append(doc["user_id"])
+        if not changed:
+            return
+
+        async for snapshot in self.collection.find({"user_id": {"$in": changed}}, {"_id": 0}):
+            if self.cache is not None:
+                self.cache.remember(snapshot)
+            self.publish(snapshot["user_id"], snapshot)
+
+    async def run(self):
+        if self.poll_interval <= 0:
+            return
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Display update poll failed: %s", e)
+            await asyncio.sleep(self.poll_interval)
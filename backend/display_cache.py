@@ -0,0 +1,105 @@
+"""
+Display Snapshot Cache for Look@Me CMS
+Keeps a materialized /api/display document per user, in an in-process LRU (with TTL)
+backed by the display_snapshots collection in MongoDB
+"""
+
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict
+from datetime import datetime, timezone
+
+from cachetools import TTLCache
+
+# Version of the display payload layout; bump whenever build_display_data changes
+# shape so snapshots persisted by an older build are rebuilt instead of served
+DISPLAY_SCHEMA_VERSION = 1
+
+
+def payload_etag(payload: Dict) -> str:
+    """Content hash of a display payload; equal payloads always get the same tag"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def is_current_snapshot(snapshot: Dict) -> bool:
+    """Whether a persisted snapshot was built with this payload layout"""
+    return "etag" in snapshot and snapshot.get("schema_version") == DISPLAY_SCHEMA_VERSION
+
+
+class DisplaySnapshotCache:
+    """
+    Read-through cache of precomputed display payloads
+
+    Snapshots are only rebuilt when one of their inputs changes (store config,
+    sustainability assessment, social results), so a display read costs one
+    in-memory lookup, or a single Mongo read on a cold worker.
+    """
+
+    def __init__(
+        self,
+        collection,
+        builder: Callable[[str], Awaitable[Dict]],
+        maxsize: int = 1024,
+        ttl: float = 30.0
+    ):
+        """
+        Args:
+            collection: Motor collection used to persist snapshots
+            builder: Coroutine building the display payload for a user_id
+            maxsize: Maximum number of snapshots kept in memory
+            ttl: Seconds a snapshot stays in memory before it is re-read from Mongo
+                 (bounds staleness across uvicorn workers)
+        """
+        self.collection = collection
+        self.builder = builder
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, user_id: str) -> Dict:
+        """Return the snapshot document for a user, building it on first access"""
+        snapshot = self._memory.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = await self.collection.find_one({"user_id": user_id}, {"_id": 0})
+        if snapshot is not None and is_current_snapshot(snapshot):
+            self._memory[user_id] = snapshot
+            return snapshot
+
+        return await self.rebuild(user_id)
+
+    async def rebuild(self, user_id: str) -> Dict:
+        """
+        Recompute the snapshot from its sources and store it in memory and Mongo
+
+        The snapshot carries an `etag` (content hash of the payload), the
+        `schema_version` it was built with and `modified_at`, which only moves
+        when the payload actually changed.
+        """
+        payload = await self.builder(user_id)
+        etag = payload_etag(payload)
+        now = datetime.now(timezone.utc).isoformat()
+
+        previous = await self.collection.find_one({"user_id": user_id}, {"_id": 0, "etag": 1, "modified_at": 1})
+        unchanged = previous is not None and previous.get("etag") == etag and previous.get("modified_at")
+        snapshot = {
+            "user_id": user_id,
+            "payload": payload,
+            "etag": etag,
+            "schema_version": DISPLAY_SCHEMA_VERSION,
+            "built_at": now,
+            "modified_at": previous["modified_at"] if unchanged else now
+        }
+        await self.collection.replace_one({"user_id": user_id}, snapshot, upsert=True)
+        self._memory[user_id] = snapshot
+        return snapshot
+
+    def remember(self, snapshot: Dict):
+        """Keep a snapshot rebuilt elsewhere (e.g. by another worker) in memory"""
+        if is_current_snapshot(snapshot):
+            self._memory[snapshot["user_id"]] = snapshot
+
+    async def invalidate(self, user_id: str):
+        """Drop a snapshot so the next read rebuilds it from its sources"""
+        self._memory.pop(user_id, None)
+        await self.collection.delete_one({"user_id": user_id})
@@ -0,0 +1,53 @@
+"""
+Gemini Streaming for Look@Me CMS
+Streams text from the Gemini generateContent API over server-sent events
+"""
+
+import json
+from typing import AsyncIterator
+
+import httpx
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+
+async def stream_generate(
+    http_client: httpx.AsyncClient,
+    api_key: str,
+    model: str,
+    system_message: str,
+    prompt: str
+) -> AsyncIterator[str]:
+    """
+    Yield the reply text chunk by chunk as Gemini produces it
+
+    Args:
+        http_client: Pooled client used for the request
+        api_key: Gemini API key
+        model: Model name, e.g. gemini-2.0-flash
+        system_message: System instruction
+        prompt: User prompt
+    """
+    body = {
+        "system_instruction": {"parts": [{"text": system_message}]},
+        "contents": [{"role": "user", "parts": [{"text": prompt}]}]
+    }
+    async with http_client.stream(
+        "POST",
+        f"{GEMINI_API_URL}/{model}:streamGenerateContent",
+        params={"alt": "sse"},
+        headers={"x-goog-api-key": api_key},
+        json=body
+    ) as response:
+        if response.status_code != 200:
+            await response.aread()
+            raise Exception(f"Gemini API error {response.status_code}: {response.text}")
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            chunk = json.loads(line[5:])
+            for candidate in chunk.get("candidates", [])[:1]:
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
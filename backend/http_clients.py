@@ -0,0 +1,87 @@
+"""
+Shared HTTP clients for Look@Me CMS
+Builds long-lived, pooled httpx clients for outbound services (BrightData, TripAdvisor)
+"""
+
+import os
+import time
+from typing import Callable, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _env(service: str, name: str, default: str) -> str:
+    return os.environ.get(f"{service.upper()}_HTTP_{name}", default)
+
+
+class ObservedTransport(httpx.AsyncBaseTransport):
+    """
+    Reports each request to an observer as (request, status_code, seconds)
+
+    status_code is None when the request failed without a response. Timing
+    stops when the response headers arrive, so streamed bodies are not included.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, observer: Callable[[httpx.Request, Optional[int], float], None]):
+        self.transport = transport
+        self.observer = observer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            self.observer(request, None, time.perf_counter() - started)
+            raise
+        self.observer(request, response.status_code, time.perf_counter() - started)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def create_http_client(
+    service: str,
+    timeout: float = 30.0,
+    observer: Optional[Callable[[httpx.Request, Optional[int], float], None]] = None,
+    **kwargs
+) -> httpx.AsyncClient:
+    """
+    Create a pooled AsyncClient for an external service
+
+    Pool limits and timeouts can be tuned per service through environment
+    variables, e.g. BRIGHTDATA_HTTP_MAX_CONNECTIONS or TRIPADVISOR_HTTP_TIMEOUT.
+
+    Args:
+        service: Service name used as environment variable prefix
+        timeout: Default read/write timeout in seconds
+        observer: Called with (request, status_code, seconds) after every request
+        **kwargs: Extra httpx.AsyncClient arguments (e.g. transport for tests)
+
+    Returns:
+        httpx.AsyncClient with keep-alive and, when available, HTTP/2 enabled
+    """
+    limits = httpx.Limits(
+        max_connections=int(_env(service, "MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(_env(service, "MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(_env(service, "KEEPALIVE_EXPIRY", "30"))
+    )
+    client_timeout = httpx.Timeout(
+        float(_env(service, "TIMEOUT", str(timeout))),
+        connect=float(_env(service, "CONNECT_TIMEOUT", "10")),
+        pool=float(_env(service, "POOL_TIMEOUT", "10"))
+    )
+    http2 = _env(service, "HTTP2", "true").lower() == "true" and HTTP2_AVAILABLE
+
+    if observer is None:
+        return httpx.AsyncClient(limits=limits, timeout=client_timeout, http2=http2, **kwargs)
+
+    # With an explicit transport httpx ignores limits/http2, so they go on the transport
+    transport = kwargs.pop("transport", None) or httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    return httpx.AsyncClient(timeout=client_timeout, transport=ObservedTransport(transport, observer), **kwargs)
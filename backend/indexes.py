@@ -0,0 +1,205 @@
+"""
+MongoDB Index Bootstrap for Look@Me CMS
+Declares the indexes behind every hot query path, reconciles them idempotently at
+startup and reports the hot queries that would still scan a whole collection
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Options compared when deciding whether an existing index matches its declaration
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Collections created as time-series before their indexes are declared
+TIME_SERIES_COLLECTIONS: Dict[str, Dict] = {
+    "social_metrics": {"timeField": "ts", "metaField": "meta", "granularity": "hours"}
+}
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id")
+    ],
+    "store_configs": [
+        IndexModel([("user_id", ASCENDING)], name="user_id")
+    ],
+    "brightdata_jobs": [
+        IndexModel([("job_id", ASCENDING), ("user_id", ASCENDING)], name="job_id_user_id"),
+        # Keyset pagination of my-jobs, optionally filtered by platform or status
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("job_id", DESCENDING)], name="user_id_created_at_job_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("platform", ASCENDING), ("created_at", DESCENDING), ("job_id", DESCENDING)],
+            name="user_id_platform_created_at_job_id"
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("job_id", DESCENDING)],
+            name="user_id_status_created_at_job_id"
+        ),
+        IndexModel([("status", ASCENDING), ("job_id", ASCENDING)], name="status_job_id")
+    ],
+    "sustainability_assessments": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_id_created_at"),
+        IndexModel([("input_hash", ASCENDING), ("created_at", DESCENDING)], name="input_hash_created_at")
+    ],
+    "display_snapshots": [
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True)
+    ],
+    "social_latest": [
+        IndexModel([("user_id", ASCENDING), ("platform", ASCENDING)], name="user_id_platform_unique", unique=True)
+    ],
+    "social_results_cache": [
+        IndexModel([("key", ASCENDING)], name="key_unique", unique=True),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+    ],
+    "brightdata_inflight": [
+        IndexModel(
+            [("key", ASCENDING)],
+            name="key_running_unique",
+            unique=True,
+            partialFilterExpression={"status": "running"}
+        ),
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+        # Done/abandoned claims are only kept for an hour (running claims have no released_at)
+        IndexModel([("released_at", ASCENDING)], name="released_at_ttl", expireAfterSeconds=3600)
+    ],
+    "revoked_tokens": [
+        IndexModel([("digest", ASCENDING)], name="digest_unique", unique=True),
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+    ],
+    "social_metrics": [
+        IndexModel([("meta.user_id", ASCENDING), ("meta.platform", ASCENDING), ("ts", ASCENDING)], name="user_id_platform_ts")
+    ],
+    "social_metrics_rollups": [
+        IndexModel(
+            [("user_id", ASCENDING), ("granularity", ASCENDING), ("platform", ASCENDING), ("bucket_start", ASCENDING)],
+            name="user_id_granularity_platform_bucket_unique",
+            unique=True
+        ),
+        # Only hourly buckets carry expires_at
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+    ]
+}
+
+# Representative filter/sort of each hot query, checked with explain() at startup
+HOT_QUERIES: List[Tuple[str, Dict, List]] = [
+    ("users", {"username": ""}, []),
+    ("users", {"email": ""}, []),
+    ("users", {"id": ""}, []),
+    ("store_configs", {"user_id": ""}, []),
+    ("brightdata_jobs", {"job_id": "", "user_id": ""}, []),
+    ("brightdata_jobs", {"user_id": ""}, [("created_at", DESCENDING), ("job_id", DESCENDING)]),
+    ("brightdata_jobs", {"user_id": "", "platform": ""}, [("created_at", DESCENDING), ("job_id", DESCENDING)]),
+    ("brightdata_jobs", {"user_id": "", "status": ""}, [("created_at", DESCENDING), ("job_id", DESCENDING)]),
+    ("brightdata_jobs", {"status": {"$in": ["running", "ready"]}}, []),
+    ("sustainability_assessments", {"user_id": ""}, [("created_at", DESCENDING)]),
+    ("sustainability_assessments", {"input_hash": "", "created_at": {"$gte": ""}}, [("created_at", DESCENDING)]),
+    ("display_snapshots", {"user_id": ""}, []),
+    ("social_latest", {"user_id": ""}, []),
+    ("social_results_cache", {"key": ""}, []),
+    ("brightdata_inflight", {"key": "", "status": "running"}, []),
+    ("social_metrics_rollups", {"user_id": "", "granularity": "day", "bucket_start": {"$gte": ""}}, [("platform", ASCENDING), ("bucket_start", ASCENDING)])
+]
+
+
+def _matches(existing: Dict, declared: Dict) -> bool:
+    if list(existing["key"]) != list(declared["key"].items()):
+        return False
+    return all(existing.get(option) == declared.get(option) for option in INDEX_OPTIONS)
+
+
+async def ensure_time_series_collections(db):
+    """
+    Create the declared time-series collections that do not exist yet
+
+    Must run before their indexes are created, which would otherwise create a
+    regular collection. Servers without time-series support (MongoDB < 5.0)
+    keep a regular collection.
+    """
+    existing = set(await db.list_collection_names())
+    for name, options in TIME_SERIES_COLLECTIONS.items():
+        if name in existing:
+            continue
+        try:
+            await db.create_collection(name, timeseries=options)
+        except CollectionInvalid:
+            pass  # Created concurrently by another worker
+        except OperationFailure as e:
+            logger.warning("Could not create time-series collection %s: %s", name, e)
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create missing indexes and rebuild the ones whose definition changed
+
+    Indexes that are not declared here are left untouched.
+
+    Returns:
+        Dict mapping collection name to the index names created or rebuilt
+    """
+    await ensure_time_series_collections(db)
+
+    changed = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+
+        for model in models:
+            declared = model.document
+            name = declared["name"]
+            # Same name, or same keys under another name
+            current_name = name if name in existing else next(
+                (n for n, info in existing.items() if list(info["key"]) == list(declared["key"].items())),
+                None
+            )
+            if current_name is not None and _matches(existing[current_name], declared):
+                continue
+
+            try:
+                if current_name is not None:
+                    logger.info("Rebuilding index %s.%s", collection_name, current_name)
+                    await collection.drop_index(current_name)
+                await collection.create_indexes([model])
+                changed.setdefault(collection_name, []).append(name)
+            except OperationFailure as e:
+                # e.g. duplicates preventing a unique index; keep serving without it
+                logger.error("Could not create index %s.%s: %s", collection_name, name, e)
+
+    return changed
+
+
+async def has_unique_indexes(collection, names: List[str]) -> bool:
+    """Whether every named index exists on the collection and is unique"""
+    existing = await collection.index_information()
+    return all(existing.get(name, {}).get("unique") for name in names)
+
+
+def _has_collection_scan(plan) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_has_collection_scan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_collection_scan(value) for value in plan)
+    return False
+
+
+async def report_collection_scans(db) -> List[str]:
+    """Explain every hot query and log the ones still planned as a collection scan"""
+    scans = []
+    for collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        if _has_collection_scan(explain.get("queryPlanner", {}).get("winningPlan", {})):
+            description = f"{collection_name} {query} sort={sort}"
+            scans.append(description)
+            logger.warning("Hot query uses a collection scan: %s", description)
+    return scans
@@ -0,0 +1,189 @@
+"""
+BrightData Job Poller for Look@Me CMS
+Background task tracking every running crawl job, polling the progress API with
+per-job exponential backoff and completing each snapshot as soon as it is ready
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Set
+
+from pymongo.errors import DuplicateKeyError
+
+from brightdata_integration import BrightDataClient
+
+logger = logging.getLogger(__name__)
+
+
+class JobPoller:
+    """
+    Multiplexes status polling for all running snapshots of a worker
+
+    Poll state is kept in memory per job; a short lease in the
+    brightdata_job_leases collection makes sure only one uvicorn worker polls a
+    given snapshot at a time.
+    """
+
+    def __init__(
+        self,
+        db,
+        get_client: Callable[[], BrightDataClient],
+        on_ready: Callable[[str], Awaitable[Dict]],
+        on_failed: Callable[[str, str], Awaitable],
+        initial_delay: float = 5.0,
+        max_delay: float = 300.0,
+        max_concurrency: int = 10,
+        scan_interval: float = 5.0,
+        max_age: timedelta = timedelta(hours=6)
+    ):
+        """
+        Args:
+            db: Motor database holding brightdata_jobs
+            get_client: Returns the shared BrightDataClient
+            on_ready: Coroutine called with the job_id of a ready snapshot; it downloads
+                and stores the results and returns the get_results response
+            on_failed: Coroutine called with (job_id, error message)
+            initial_delay: Seconds before the first poll, and the base backoff
+            max_delay: Upper bound for the per-job backoff
+            max_concurrency: Maximum BrightData calls in flight at once
+            scan_interval: How often brightdata_jobs is scanned for new running jobs
+            max_age: Jobs still running after this long are marked failed
+        """
+        self.db = db
+        self.get_client = get_client
+        self.on_ready = on_ready
+        self.on_failed = on_failed
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.scan_interval = scan_interval
+        self.max_age = max_age
+        self.worker_id = str(uuid.uuid4())
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._jobs: Dict[str, Dict] = {}
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def tracked_count(self) -> int:
+        """Number of running jobs currently tracked by this worker"""
+        return len(self._jobs)
+
+    async def run(self):
+        """Scan and poll forever; cancel the task to stop"""
+        next_scan = 0.0
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                now = loop.time()
+                if now >= next_scan:
+                    try:
+                        await self._scan()
+                    except Exception as e:
+                        logger.warning("Job poller scan failed: %s", e)
+                    next_scan = now + self.scan_interval
+
+                for job_id, state in list(self._jobs.items()):
+                    if state["next_poll"] <= now and job_id not in self._in_flight:
+                        self._in_flight.add(job_id)
+                        task = asyncio.create_task(self._poll(job_id))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+
+                due = [s["next_poll"] for j, s in self._jobs.items() if j not in self._in_flight]
+                wake_at = min(due + [next_scan])
+                await asyncio.sleep(max(0.05, wake_at - loop.time()))
+        finally:
+            for task in self._tasks:
+                task.cancel()
+
+    async def _scan(self):
+        """Start tracking new running jobs and forget the ones finished elsewhere"""
+        running = await self.db.brightdata_jobs.distinct(
+            "job_id", {"status": {"$in": ["running", "ready"]}}
+        )
+        now = asyncio.get_running_loop().time()
+        for job_id in running:
+            if job_id and job_id not in self._jobs:
+                self._jobs[job_id] = {"delay": self.initial_delay, "next_poll": now + self.initial_delay}
+        for job_id in set(self._jobs) - set(running) - self._in_flight:
+            del self._jobs[job_id]
+
+    async def claim(self, job_id: str, lease: float) -> bool:
+        """
+        Take the poll lease for a job so other workers skip it until it expires
+
+        Also taken by the webhook handler while it completes a notified
+        snapshot, so the poller and the webhook never download it together.
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self.db.brightdata_job_leases.find_one_and_update(
+                {"_id": job_id, "lease_until": {"$lt": now}},
+                {"$set": {"lease_until": now + timedelta(seconds=lease), "owner": self.worker_id}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _poll(self, job_id: str):
+        state = self._jobs.get(job_id)
+        try:
+            if state is None or not await self.claim(job_id, state["delay"]):
+                return self._backoff(job_id)
+
+            async with self._semaphore:
+                status = await self.get_client().check_job_status(job_id)
+
+                if status.get("status") == "ready":
+                    result = await self.on_ready(job_id)
+                    if result.get("status") == "completed":
+                        return await self._forget(job_id)
+                elif status.get("status") == "failed":
+                    await self.on_failed(job_id, status.get("error") or "Crawl failed")
+                    return await self._forget(job_id)
+
+            if "progress" in status:
+                await self.db.brightdata_jobs.update_many(
+                    {"job_id": job_id, "status": "running"},
+                    {"$set": {"progress": status["progress"]}}
+                )
+            if await self._expired(job_id):
+                await self.on_failed(job_id, f"Job did not complete within {self.max_age}")
+                return await self._forget(job_id)
+            self._backoff(job_id)
+        except Exception as e:
+            logger.warning("Polling job %s failed: %s", job_id, e)
+            self._backoff(job_id)
+        finally:
+            self._in_flight.discard(job_id)
+
+    async def _expired(self, job_id: str) -> bool:
+        oldest = await self.db.brightdata_jobs.find_one(
+            {"job_id": job_id}, {"_id": 0, "created_at": 1}, sort=[("created_at", 1)]
+        )
+        if not oldest or not oldest.get("created_at"):
+            return False
+        created_at = datetime.fromisoformat(oldest["created_at"])
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - created_at > self.max_age
+
+    def _backoff(self, job_id: str):
+        state = self._jobs.get(job_id)
+        if state is None:
+            return
+        # Exponential backoff with jitter so polls of jobs started together spread out
+        state["delay"] = min(state["delay"] * 2, self.max_delay)
+        state["next_poll"] = asyncio.get_running_loop().time() + state["delay"] * random.uniform(0.8, 1.2)
+
+    async def release(self, job_id: str):
+        """Drop the lease of a finished job"""
+        await self.db.brightdata_job_leases.delete_one({"_id": job_id})
+
+    async def _forget(self, job_id: str):
+        self._jobs.pop(job_id, None)
+        await self.release(job_id)
@@ -0,0 +1,105 @@
+"""
+Incremental JSON Parsing for Look@Me CMS
+Extracts the first JSON object from streamed LLM text and reports each top-level
+field as soon as its value is complete
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JsonFieldStream:
+    """
+    Feed text chunks, get completed top-level fields back
+
+    Text before the first '{' (prose, a ```json fence) is skipped, as is
+    anything after the matching '}'. Braces and brackets inside strings are
+    ignored, so the object ends where it actually ends rather than at the
+    last '}' of the reply.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None  # Start of the current key or value
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Returns:
+            (name, value) of every field completed by this chunk
+        """
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self.done:
+            char = buffer[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key is None:
+                        # End of a top-level key; its value starts after the ':'
+                        self._key = json.loads(buffer[self._token_start:self._pos + 1])
+                        self._token_start = None
+                self._pos += 1
+                continue
+
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None:
+                    self._token_start = self._pos
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete(buffer, completed)
+                    self.done = True
+            elif char == ":" and self._depth == 1:
+                self._token_start = self._pos + 1
+            elif char == "," and self._depth == 1:
+                self._complete(buffer, completed)
+            self._pos += 1
+
+        return completed
+
+    def _complete(self, buffer: str, completed: List[Tuple[str, Any]]):
+        if self._key is None or self._token_start is None:
+            return
+        value = json.loads(buffer[self._token_start:self._pos])
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+        self._key = None
+        self._token_start = None
+
+    def result(self) -> Dict[str, Any]:
+        """The parsed object; raises ValueError when the text held no complete object"""
+        if not self.done:
+            raise ValueError("No complete JSON object in response")
+        return json.loads(self.buffer[self._start:self._pos])
+
+
+def extract_json_object(text: str) -> Dict[str, Any]:
+    """Parse the first complete JSON object in an LLM reply"""
+    stream = JsonFieldStream()
+    stream.feed(text)
+    return stream.result()
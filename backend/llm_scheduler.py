@@ -0,0 +1,191 @@
+"""
+LLM Call Scheduler for Look@Me CMS
+Bounds concurrent LLM calls per worker, serves users round-robin, coalesces
+identical in-flight prompts and sheds load when the queue is full
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class LlmBusy(Exception):
+    """
+    Raised when a call cannot be queued
+
+    status_code is 429 when the user already has too many calls waiting and
+    503 when the whole queue is full or queued work timed out.
+    """
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: int = 1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    __slots__ = ("user_id", "granted")
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.granted = asyncio.get_running_loop().create_future()
+
+
+class LlmScheduler:
+    """
+    In-process scheduler for LLM calls
+
+    At most `max_concurrency` calls run at once. Waiting calls are kept in one
+    queue per user and a free slot goes to the next user in rotation, so one
+    user's burst cannot starve everybody else. Calls submitted with the same
+    key while one is running share its result.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        max_per_user: int = 2,
+        queue_timeout: float = 20.0
+    ):
+        """
+        Args:
+            max_concurrency: Calls allowed to run at the same time
+            max_queue: Calls allowed to wait for a slot, across all users
+            max_per_user: Calls one user may have waiting or running
+            queue_timeout: Seconds a call may wait for a slot before it is dropped
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self.queue_timeout = queue_timeout
+        self._queues: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._per_user: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._admitted = 0  # Calls running or waiting
+        self._running = 0
+        self._queued = 0
+        self._avg_seconds = 5.0
+        self._stats = {"completed": 0, "failed": 0, "coalesced": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free slot"""
+        return self._queued
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "running": self._running,
+            "queue_depth": self._queued,
+            "avg_seconds": round(self._avg_seconds, 3)
+        }
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, from the average call duration"""
+        waves = self._admitted / max(1, self.max_concurrency)
+        return max(1, int(waves * self._avg_seconds))
+
+    async def submit(self, user_id: str, call: Callable[[], Awaitable[Any]], key: Optional[str] = None) -> Any:
+        """
+        Run `call` once a slot is free
+
+        Args:
+            user_id: Owner of the call, for fairness and the per-user limit
+            call: Zero-argument coroutine function making the LLM request
+            key: Identity of the prompt; submissions with the key of a running
+                call wait for that call instead of making their own
+
+        Raises:
+            LlmBusy: The queue is full or the call waited longer than queue_timeout
+        """
+        if key is not None and key in self._inflight:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        if self._per_user.get(user_id, 0) >= self.max_per_user:
+            self._stats["rejected"] += 1
+            raise LlmBusy("Too many assessments in progress", status_code=429, retry_after=self.retry_after())
+        if self._admitted >= self.max_concurrency + self.max_queue:
+            self._stats["rejected"] += 1
+            raise LlmBusy("Assessment queue is full", retry_after=self.retry_after())
+
+        # Counted before the task starts so a burst in one loop tick is bounded too
+        self._admitted += 1
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+        # The call runs as its own task so a disconnecting requester does not
+        # cancel it for the others sharing its result
+        task = asyncio.ensure_future(self._execute(user_id, call))
+        if key is not None:
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _execute(self, user_id: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            await self._acquire(user_id)
+            started = time.perf_counter()
+            try:
+                result = await call()
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+            finally:
+                self._running -= 1
+                self._dispatch()
+            # Smoothed duration drives the Retry-After estimate
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.perf_counter() - started)
+            self._stats["completed"] += 1
+            return result
+        finally:
+            self._admitted -= 1
+            self._per_user[user_id] -= 1
+            if not self._per_user[user_id]:
+                del self._per_user[user_id]
+
+    async def _acquire(self, user_id: str):
+        if self._running < self.max_concurrency and not self._queued:
+            self._running += 1
+            return
+
+        ticket = _Ticket(user_id)
+        self._queues.setdefault(user_id, deque()).append(ticket)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.granted), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if ticket.granted.done():
+                return  # Granted just as the timeout fired; the slot is ours
+            self._withdraw(ticket)
+            self._stats["timed_out"] += 1
+            raise LlmBusy("Timed out waiting for an assessment slot", retry_after=self.retry_after())
+        except BaseException:
+            if ticket.granted.done():
+                self._running -= 1
+                self._dispatch()
+            else:
+                self._withdraw(ticket)
+            raise
+
+    def _withdraw(self, ticket: _Ticket):
+        queue = self._queues.get(ticket.user_id)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            self._queued -= 1
+            if not queue:
+                del self._queues[ticket.user_id]
+
+    def _dispatch(self):
+        """Hand free slots to waiting users in round-robin order"""
+        while self._running < self.max_concurrency and self._queues:
+            user_id, queue = next(iter(self._queues.items()))
+            ticket = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(user_id)
+            else:
+                del self._queues[user_id]
+            self._running += 1
+            ticket.granted.set_result(None)
@@ -0,0 +1,93 @@
+"""
+Password Hashing for Look@Me CMS
+Runs PBKDF2-SHA256 hashing and verification on a dedicated, bounded thread pool
+so a login never stalls the event loop
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full; the request should be retried later"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Async facade over passlib's CryptContext
+
+    hashlib's PBKDF2 releases the GIL, so a small thread pool hashes in
+    parallel with request handling. Submissions beyond `max_queue` waiting
+    jobs are rejected instead of piling up.
+    """
+
+    def __init__(self, rounds: Optional[int] = None, workers: int = 2, max_queue: int = 32):
+        """
+        Args:
+            rounds: PBKDF2 iterations. When set, hashes made with other parameters
+                are reported by verify_and_update so they can be rehashed on login.
+            workers: Threads dedicated to hashing
+            max_queue: Jobs allowed to wait for a free thread
+        """
+        settings = {}
+        if rounds:
+            settings = {
+                "pbkdf2_sha256__default_rounds": rounds,
+                "pbkdf2_sha256__min_rounds": rounds,
+                "pbkdf2_sha256__max_rounds": rounds
+            }
+        self.context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **settings)
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._in_flight = 0
+        self._stats = {"hashed": 0, "verified": 0, "rehashed": 0, "rejected": 0, "seconds_total": 0.0}
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a hashing thread"""
+        return max(0, self._in_flight - self.workers)
+
+    def stats(self) -> Dict:
+        return {**self._stats, "in_flight": self._in_flight, "queue_depth": self.queue_depth}
+
+    async def hash(self, password: str) -> str:
+        password_hash = await self._run(self.context.hash, password)
+        self._stats["hashed"] += 1
+        return password_hash
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns:
+            (valid, new_hash); new_hash is set when the stored hash was made with
+            outdated parameters and should replace it
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, password_hash)
+        self._stats["verified"] += 1
+        if new_hash:
+            self._stats["rehashed"] += 1
+        return valid, new_hash
+
+    async def _run(self, fn, *args):
+        if self.queue_depth >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise HashingBusy()
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._in_flight -= 1
+            self._stats["seconds_total"] += time.perf_counter() - started
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
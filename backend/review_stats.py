@@ -0,0 +1,144 @@
+"""
+Review Statistics for Look@Me CMS
+Batched aggregation of the review records in a BrightData snapshot: rating
+distribution, mean, trend and weekly volume, computed with NumPy over every
+review at once instead of record by record
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Field names carrying a review's star rating / date across the review datasets
+RATING_FIELDS = ("review_rating", "rating_value", "stars")
+DATE_FIELDS = ("review_date", "date", "published_at")
+
+# 1970-01-01 was a Thursday; offsetting by 4 days aligns weeks on Mondays
+_MONDAY_OFFSET_DAYS = 4
+_DAY_SECONDS = 86400
+
+# Weeks kept in weekly_volume, most recent last
+MAX_WEEKS = 26
+
+
+def _first(record: Dict, fields: Iterable[str]):
+    for name in fields:
+        value = record.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _timestamp(value) -> float:
+    """Seconds since the epoch of an ISO date or epoch number; NaN when unparseable"""
+    if isinstance(value, (int, float)):
+        return float(value) / 1000 if value > 1e11 else float(value)  # Milliseconds or seconds
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return float("nan")
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return float("nan")
+
+
+def _rating(value) -> float:
+    try:
+        rating = float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+    return rating if 1 <= rating <= 5 else float("nan")
+
+
+class ReviewSeries:
+    """
+    Compact (rating, timestamp) pairs of one profile's rated reviews
+
+    Filled record by record while a snapshot streams in, so only two floats per
+    review are kept instead of the review rows themselves.
+    """
+
+    __slots__ = ("ratings", "times")
+
+    def __init__(self):
+        self.ratings = array("d")
+        self.times = array("d")  # NaN when the review has no parseable date
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "ReviewSeries":
+        series = cls()
+        for record in records:
+            series.add(record)
+        return series
+
+    def add(self, record: Dict) -> bool:
+        """Fold one snapshot record in; rows without a rating (profile-only rows) are skipped"""
+        rating = _rating(_first(record, RATING_FIELDS))
+        if np.isnan(rating):
+            return False
+        self.ratings.append(rating)
+        self.times.append(_timestamp(_first(record, DATE_FIELDS)))
+        return True
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+
+def review_aggregates(series: ReviewSeries, max_weeks: int = MAX_WEEKS) -> Optional[Dict]:
+    """
+    Aggregate the reviews of one profile
+
+    Args:
+        series: Ratings and dates of the profile's rated reviews
+        max_weeks: Number of most recent weeks reported in weekly_volume
+
+    Returns:
+        Dict with reviews_analyzed, mean_rating, rating_distribution (counts of
+        1 to 5 stars), trend_per_week (change in rating per week, least squares)
+        and weekly_volume; None when there are no rated reviews
+    """
+    if not len(series):
+        return None
+
+    ratings = np.frombuffer(series.ratings, dtype=float)
+    times = np.frombuffer(series.times, dtype=float)
+
+    stars = np.clip(np.rint(ratings), 1, 5).astype(np.int64)
+    distribution = np.bincount(stars, minlength=6)[1:]
+
+    dated = ~np.isnan(times)
+    trend = 0.0
+    weekly: List[Dict] = []
+    if dated.any():
+        dated_times, dated_ratings = times[dated], ratings[dated]
+        weeks = dated_times / (7 * _DAY_SECONDS)
+        if np.ptp(weeks) > 0:
+            trend = float(np.polyfit(weeks, dated_ratings, 1)[0])
+
+        # Week index counted from the first Monday on or before 1970-01-01
+        week_index = np.floor((dated_times / _DAY_SECONDS + 7 - _MONDAY_OFFSET_DAYS) / 7).astype(np.int64)
+        first = max(int(week_index.min()), int(week_index.max()) - max_weeks + 1)
+        in_window = week_index >= first
+        offsets = week_index[in_window] - first
+        counts = np.bincount(offsets)
+        sums = np.bincount(offsets, weights=dated_ratings[in_window])
+
+        for offset in np.flatnonzero(counts):
+            start_days = (first + int(offset)) * 7 + _MONDAY_OFFSET_DAYS - 7
+            weekly.append({
+                "week_start": datetime.fromtimestamp(start_days * _DAY_SECONDS, tz=timezone.utc).date().isoformat(),
+                "count": int(counts[offset]),
+                "mean_rating": round(float(sums[offset] / counts[offset]), 2)
+            })
+
+    return {
+        "reviews_analyzed": int(len(ratings)),
+        "mean_rating": round(float(ratings.mean()), 2),
+        "rating_distribution": {str(star): int(count) for star, count in enumerate(distribution, start=1)},
+        "trend_per_week": round(trend, 3),
+        "weekly_volume": weekly
+    }
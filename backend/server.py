@@ -1,20 +1,125 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
-from passlib.context import CryptContext
+from contextlib import asynccontextmanager
+from email.utils import format_datetime, parsedate_to_datetime
 import jwt
 import os
+import base64
+import hashlib
+import hmac
 import uuid
+import json
 import httpx
+import asyncio
+import logging
+import time
 from dotenv import load_dotenv
 
+from http_clients import create_http_client
+from display_cache import DisplaySnapshotCache
+from display_broker import DisplayBroker
+from compression import CompressionMiddleware
+from indexes import ensure_indexes, has_unique_indexes, report_collection_scans
+from password_hashing import PasswordHasher, HashingBusy
+from llm_scheduler import LlmScheduler, LlmBusy
+from json_stream import JsonFieldStream, extract_json_object
+from gemini_stream import stream_generate
+from token_cache import VerifiedTokenCache, token_digest
+from metrics import Registry, MetricsMiddleware, MongoCommandMetrics, HttpCallObserver, brightdata_endpoint
+
 load_dotenv()
 
-app = FastAPI(title="Look@Me CMS API")
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Long-lived, pooled HTTP clients (one per external service)
+    get_brightdata_client()
+    get_tripadvisor_http()
+    
+    # Declare/reconcile indexes for every hot query path
+    if os.environ.get('MONGO_INDEX_BOOTSTRAP', 'true').lower() == 'true':
+        try:
+            changed = await ensure_indexes(db)
+            if changed:
+                logger.info("Created or rebuilt indexes: %s", changed)
+            await report_collection_scans(db)
+        except Exception as e:
+            logger.warning("Index bootstrap failed: %s", e)
+    
+    # Registration relies on these for duplicate protection; pre-checks stay on without them
+    global users_unique_indexes
+    try:
+        users_unique_indexes = await has_unique_indexes(db.users, ["username_unique", "email_unique"])
+    except Exception as e:
+        logger.warning("Could not inspect users indexes: %s", e)
+        users_unique_indexes = False
+    if not users_unique_indexes:
+        logger.warning("users.username_unique/email_unique missing; registration falls back to duplicate pre-checks")
+    
+    # Single-flight claims are only exclusive with this index; without it every crawl is triggered on its own
+    global crawl_dedup_enabled
+    try:
+        crawl_dedup_enabled = await has_unique_indexes(db.brightdata_inflight, ["key_running_unique"])
+    except Exception as e:
+        logger.warning("Could not inspect brightdata_inflight indexes: %s", e)
+        crawl_dedup_enabled = False
+    if not crawl_dedup_enabled:
+        logger.error("brightdata_inflight.key_running_unique missing; crawl deduplication and batching are disabled")
+    
+    background_tasks = [asyncio.create_task(token_revocation_loop())]
+    if BRIGHTDATA_API_TOKEN and SOCIAL_REFRESH_INTERVAL_HOURS > 0:
+        background_tasks.append(asyncio.create_task(social_refresh_loop()))
+    if job_poller is not None:
+        background_tasks.append(asyncio.create_task(job_poller.run()))
+    background_tasks.append(asyncio.create_task(display_broker.run()))
+    
+    yield
+    
+    for task in background_tasks:
+        task.cancel()
+    display_broker.close()
+    await crawl_batcher.close()
+    await close_http_clients()
+    password_hasher.shutdown()
+
+# Metrics (kept per worker, scraped from /api/metrics)
+metrics_registry = Registry()
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+http_request_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency (event streams excluded)", ["method", "route", "status"]
+)
+mongo_command_seconds = metrics_registry.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"]
+)
+mongo_command_failures_total = metrics_registry.counter(
+    "mongo_command_failures_total", "Failed MongoDB commands", ["collection", "command"]
+)
+external_request_seconds = metrics_registry.histogram(
+    "external_request_duration_seconds", "Outbound API latency until response headers", ["service", "endpoint"]
+)
+external_request_errors_total = metrics_registry.counter(
+    "external_request_errors_total", "Outbound API calls failing or answering 4xx/5xx", ["service", "endpoint", "status"]
+)
+llm_call_seconds = metrics_registry.histogram(
+    "llm_call_duration_seconds", "Sustainability LLM call latency", ["mode", "outcome"]
+)
+
+def http_observer(service: str, endpoint=None) -> HttpCallObserver:
+    return HttpCallObserver(external_request_seconds, external_request_errors_total, service, endpoint)
+
+# orjson renders every response; handlers with a response_model are serialized by pydantic-core
+app = FastAPI(title="Look@Me CMS API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS Configuration
 origins = os.environ.get('CORS_ORIGINS', '*').split(',')
@@ -25,17 +130,40 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+    gzip_level=int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6')),
+    brotli_quality=int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+)
+app.add_middleware(MetricsMiddleware, requests=http_requests_total, latency=http_request_seconds)
 
 # Database
-client = AsyncIOMotorClient(os.environ.get('MONGO_URL'))
+client = AsyncIOMotorClient(
+    os.environ.get('MONGO_URL'),
+    event_listeners=[MongoCommandMetrics(mongo_command_seconds, mongo_command_failures_total)]
+)
 db = client[os.environ.get('DB_NAME', 'lookatme_cms')]
 
 # Security
-import hashlib
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+password_hasher = PasswordHasher(
+    rounds=int(os.environ['PASSWORD_HASH_ROUNDS']) if os.environ.get('PASSWORD_HASH_ROUNDS') else None,
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', '2')),
+    max_queue=int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', '32'))
+)
+
+# Bounds concurrent Gemini calls per worker; excess requests get 429/503 with Retry-After
+llm_scheduler = LlmScheduler(
+    max_concurrency=int(os.environ.get('LLM_MAX_CONCURRENCY', '4')),
+    max_queue=int(os.environ.get('LLM_MAX_QUEUE', '32')),
+    max_per_user=int(os.environ.get('LLM_MAX_PER_USER', '2')),
+    queue_timeout=float(os.environ.get('LLM_QUEUE_TIMEOUT_SECONDS', '20'))
+)
+
 security = HTTPBearer()
 JWT_SECRET = os.environ.get('JWT_SECRET', 'default-secret-key')
 JWT_ALGORITHM = "HS256"
+token_cache = VerifiedTokenCache(maxsize=int(os.environ.get('TOKEN_CACHE_SIZE', '10000')))
 
 # Environment Variables
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
@@ -45,6 +173,49 @@ FACEBOOK_ACCESS_TOKEN = os.environ.get('FACEBOOK_ACCESS_TOKEN', '')
 INSTAGRAM_ACCESS_TOKEN = os.environ.get('INSTAGRAM_ACCESS_TOKEN', '')
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY', '')
 BRIGHTDATA_API_TOKEN = os.environ.get('BRIGHTDATA_API_TOKEN', '')
+BRIGHTDATA_NOTIFY_URL = os.environ.get('BRIGHTDATA_NOTIFY_URL', '')
+BRIGHTDATA_WEBHOOK_SECRET = os.environ.get('BRIGHTDATA_WEBHOOK_SECRET', '')
+
+# Shared HTTP clients (created in lifespan; assign before startup to inject a stand-in)
+brightdata_client = None
+tripadvisor_http: Optional[httpx.AsyncClient] = None
+gemini_http: Optional[httpx.AsyncClient] = None
+
+def get_brightdata_client():
+    global brightdata_client
+    if brightdata_client is None:
+        brightdata_client = BrightDataClient(
+            BRIGHTDATA_API_TOKEN,
+            notify_url=BRIGHTDATA_NOTIFY_URL or None,
+            notify_auth=f"Bearer {BRIGHTDATA_WEBHOOK_SECRET}" if BRIGHTDATA_WEBHOOK_SECRET else None,
+            stream_snapshots=os.environ.get('BRIGHTDATA_STREAM_SNAPSHOTS', 'true').lower() == 'true',
+            observer=http_observer("brightdata", brightdata_endpoint)
+        )
+    return brightdata_client
+
+def get_tripadvisor_http() -> httpx.AsyncClient:
+    global tripadvisor_http
+    if tripadvisor_http is None or tripadvisor_http.is_closed:
+        tripadvisor_http = create_http_client("tripadvisor", timeout=10.0, observer=http_observer("tripadvisor"))
+    return tripadvisor_http
+
+def get_gemini_http() -> httpx.AsyncClient:
+    global gemini_http
+    if gemini_http is None or gemini_http.is_closed:
+        gemini_http = create_http_client("gemini", timeout=60.0, observer=http_observer("gemini"))
+    return gemini_http
+
+async def close_http_clients():
+    global brightdata_client, tripadvisor_http, gemini_http
+    if brightdata_client is not None:
+        await brightdata_client.aclose()
+        brightdata_client = None
+    if tripadvisor_http is not None:
+        await tripadvisor_http.aclose()
+        tripadvisor_http = None
+    if gemini_http is not None:
+        await gemini_http.aclose()
+        gemini_http = None
 
 # Models
 class User(BaseModel):
@@ -64,6 +235,20 @@ class UserLogin(BaseModel):
     username: str
     password: str
 
+class UserPublic(BaseModel):
+    id: str
+    username: str
+    email: str
+    business_name: str
+
+class AuthResponse(BaseModel):
+    message: str
+    token: str
+    user: UserPublic
+
+class MessageResponse(BaseModel):
+    message: str
+
 class StoreConfig(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
@@ -105,6 +290,7 @@ class SustainabilityRequest(BaseModel):
     business_name: str
     business_type: str
     description: Optional[str] = None
+    force_refresh: bool = False  # Skip the assessment cache and ask the model again
 
 # Helper Functions
 def create_access_token(data: dict):
@@ -115,31 +301,67 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    
+    # Recently verified tokens skip decoding and signature verification
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id = payload.get("user_id")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
+        if token_cache.is_revoked(token):
+            raise HTTPException(status_code=401, detail="Token revoked")
+        if payload.get("exp"):
+            token_cache.put(token, user_id, payload["exp"])
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# Revoked tokens are shared through MongoDB and synced into every worker's cache
+TOKEN_REVOCATION_SYNC_SECONDS = float(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', '30'))
+revocations_synced_at = None
+
+async def sync_revoked_tokens():
+    global revocations_synced_at
+    now = datetime.now(timezone.utc)
+    query = {"expires_at": {"$gt": now}}
+    if revocations_synced_at is not None:
+        query["revoked_at"] = {"$gte": revocations_synced_at - timedelta(seconds=TOKEN_REVOCATION_SYNC_SECONDS)}
+    
+    async for revoked in db.revoked_tokens.find(query, {"_id": 0, "digest": 1, "expires_at": 1}):
+        expires_at = revoked["expires_at"].replace(tzinfo=timezone.utc)
+        token_cache.revoke(revoked["digest"], expires_at.timestamp())
+    token_cache.prune()
+    revocations_synced_at = now
+
+async def token_revocation_loop():
+    while True:
+        try:
+            await sync_revoked_tokens()
+        except Exception as e:
+            logger.warning("Token revocation sync failed: %s", e)
+        await asyncio.sleep(TOKEN_REVOCATION_SYNC_SECONDS)
+
+# Set at startup once users.username_unique and users.email_unique are known to exist
+users_unique_indexes = False
+
 # Auth Endpoints
-@app.post("/api/auth/register")
+@app.post("/api/auth/register", response_model=AuthResponse)
 async def register(user_data: UserRegister):
-    # Check if user exists
-    existing_user = await db.users.find_one({"username": user_data.username})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Username already exists")
+    # Without the unique indexes (bootstrap disabled or failed, existing duplicates) check first
+    if not users_unique_indexes:
+        if await db.users.find_one({"username": user_data.username}, {"_id": 1}):
+            raise HTTPException(status_code=400, detail="Username already exists")
+        if await db.users.find_one({"email": user_data.email}, {"_id": 1}):
+            raise HTTPException(status_code=400, detail="Email already exists")
     
-    existing_email = await db.users.find_one({"email": user_data.email})
-    if existing_email:
-        raise HTTPException(status_code=400, detail="Email already exists")
-    
-    # Create user
+    # Create user (uniqueness of username and email is enforced by the users indexes)
     user = User(
         username=user_data.username,
         email=user_data.email,
@@ -147,9 +369,17 @@ async def register(user_data: UserRegister):
     )
     
     user_dict = user.dict()
-    user_dict["password_hash"] = pwd_context.hash(user_data.password)
+    try:
+        user_dict["password_hash"] = await password_hasher.hash(user_data.password)
+    except HashingBusy as e:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly", headers={"Retry-After": str(e.retry_after)})
     
-    await db.users.insert_one(user_dict)
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError as e:
+        if "email" in (e.details or {}).get("keyPattern", {}):
+            raise HTTPException(status_code=400, detail="Email already exists")
+        raise HTTPException(status_code=400, detail="Username already exists")
     
     # Create default store config
     default_config = StoreConfig(user_id=user.id)
@@ -164,15 +394,23 @@ async def register(user_data: UserRegister):
         "user": {"id": user.id, "username": user.username, "email": user.email, "business_name": user.business_name}
     }
 
-@app.post("/api/auth/login")
+@app.post("/api/auth/login", response_model=AuthResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"username": credentials.username})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not pwd_context.verify(credentials.password, user["password_hash"]):
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(credentials.password, user["password_hash"])
+    except HashingBusy as e:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly", headers={"Retry-After": str(e.retry_after)})
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    # Hash parameters changed since this password was stored: upgrade it transparently
+    if new_hash:
+        await db.users.update_one({"id": user["id"]}, {"$set": {"password_hash": new_hash}})
+    
     token = create_access_token({"user_id": user["id"]})
     
     return {
@@ -181,7 +419,26 @@ async def login(credentials: UserLogin):
         "user": {"id": user["id"], "username": user["username"], "email": user["email"], "business_name": user["business_name"]}
     }
 
-@app.get("/api/auth/me")
+@app.post("/api/auth/logout", response_model=MessageResponse)
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security), user_id: str = Depends(get_current_user)):
+    """Revoke the current token so it is rejected even while it is cached"""
+    payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    digest = token_digest(credentials.credentials)
+    
+    await db.revoked_tokens.update_one(
+        {"digest": digest},
+        {"$set": {
+            "user_id": user_id,
+            "revoked_at": datetime.now(timezone.utc),
+            "expires_at": datetime.fromtimestamp(payload["exp"], timezone.utc)
+        }},
+        upsert=True
+    )
+    token_cache.revoke(digest, payload["exp"])
+    
+    return {"message": "Logged out successfully"}
+
+@app.get("/api/auth/me", response_model=UserPublic)
 async def get_me(user_id: str = Depends(get_current_user)):
     user = await db.users.find_one({"id": user_id}, {"_id": 0})
     if not user:
@@ -204,22 +461,412 @@ async def get_store_config(user_id: str = Depends(get_current_user)):
 async def update_store_config(config_update: Dict[str, Any], user_id: str = Depends(get_current_user)):
     config_update["updated_at"] = datetime.now(timezone.utc).isoformat()
     
-    result = await db.store_configs.update_one(
+    previous_config = await db.store_configs.find_one_and_update(
         {"user_id": user_id},
-        {"$set": config_update}
+        {"$set": config_update},
+        projection={"_id": 0}
     )
     
-    if result.matched_count == 0:
+    if previous_config is None:
         raise HTTPException(status_code=404, detail="Configuration not found")
     
     updated_config = await db.store_configs.find_one({"user_id": user_id}, {"_id": 0})
+    if any(field in config_update for field in SOCIAL_CONFIG_FIELDS):
+        await forget_replaced_social_targets(user_id, previous_config, updated_config)
+    await refresh_display_snapshot(user_id)
     return {"message": "Configuration updated successfully", "config": updated_config}
 
 # Social Media Integration Endpoints (via BrightData)
-from brightdata_integration import get_social_data_via_brightdata, BrightDataClient
+from brightdata_integration import get_social_data_via_brightdata, BrightDataClient, normalize_url, parse_snapshot, results_for_url
+from crawl_batcher import CrawlBatcher
+from job_poller import JobPoller
+from single_flight import CrawlSingleFlight
+from social_cache import SocialResultsCache
+from social_metrics import SocialMetricsStore, GRANULARITIES, bucket_start
+
+# Crawl parameters per platform
+CRAWL_PARAMS = {
+    "instagram": {},
+    "facebook": {"num_of_reviews": 50},
+    "googlemaps": {"days_limit": 30}
+}
+
+# Key used for each platform in the display payload
+DISPLAY_SOCIAL_KEYS = {
+    "googlemaps": "google",
+    "facebook": "facebook",
+    "instagram": "instagram"
+}
+
+def social_targets(config: Dict) -> List[tuple]:
+    """
+    Resolve the (platform, url) pairs to crawl for a store config,
+    falling back to the legacy id fields when no URL is configured
+    """
+    def as_url(value: str, template: str) -> str:
+        return value if value.startswith("http") else template.format(value)
+    
+    targets = []
+    instagram = config.get("instagram_url") or config.get("instagram_username")
+    if instagram:
+        targets.append(("instagram", as_url(instagram, "https://www.instagram.com/{}/")))
+    facebook = config.get("facebook_url") or config.get("facebook_page_id")
+    if facebook:
+        targets.append(("facebook", as_url(facebook, "https://www.facebook.com/{}")))
+    google = config.get("google_maps_url") or config.get("google_place_id")
+    if google:
+        targets.append(("googlemaps", as_url(google, "https://www.google.com/maps/place/?q=place_id:{}")))
+    return targets
+
+# Cross-tenant batching of crawl triggers (one trigger call per dataset per window)
+crawl_batcher = CrawlBatcher(
+    get_brightdata_client,
+    window=float(os.environ.get('BRIGHTDATA_BATCH_WINDOW_SECONDS', '2')),
+    max_batch=int(os.environ.get('BRIGHTDATA_BATCH_MAX_URLS', '1000'))
+)
+
+# Set at startup once brightdata_inflight.key_running_unique is confirmed
+crawl_dedup_enabled = False
+
+# Single-flight: identical in-flight crawls (platform, normalized url, params) share one job
+crawl_single_flight = CrawlSingleFlight(
+    db.brightdata_inflight,
+    max_age=timedelta(hours=float(os.environ.get('BRIGHTDATA_JOB_MAX_AGE_HOURS', '6')))
+)
+
+async def trigger_social_crawl(platform: str, url: str, batched: bool = False) -> Dict:
+    """
+    Start a BrightData crawl, or join the identical one already running
+    
+    With batched=True the request joins the current cross-tenant batch and the
+    job shares its snapshot id with the other URLs of that batch. Both are
+    skipped while crawl_dedup_enabled is off.
+    """
+    params = CRAWL_PARAMS.get(platform)
+    batched = batched and crawl_dedup_enabled
+    
+    async def trigger() -> Dict:
+        if batched:
+            return await crawl_batcher.submit(platform, url, params)
+        return await get_social_data_via_brightdata(
+            platform=platform,
+            url=url,
+            api_token=BRIGHTDATA_API_TOKEN,
+            params=params,
+            wait_for_results=False,  # Return job_id immediately
+            client=get_brightdata_client()
+        )
+    
+    if not crawl_dedup_enabled:
+        return await trigger()
+    return await crawl_single_flight.run(platform, url, params, trigger)
+
+# Freshness-aware results cache per (platform, normalized url)
+social_cache = SocialResultsCache(
+    db.social_results_cache,
+    max_age={
+        platform: timedelta(hours=float(os.environ[f'SOCIAL_CACHE_MAX_AGE_{platform.upper()}_HOURS']))
+        for platform in CRAWL_PARAMS
+        if os.environ.get(f'SOCIAL_CACHE_MAX_AGE_{platform.upper()}_HOURS')
+    },
+    stale_window=timedelta(hours=float(os.environ.get('SOCIAL_CACHE_STALE_HOURS', '72')))
+)
+
+# Metric history: raw points in a time-series collection plus hourly/daily/weekly rollups
+SOCIAL_METRICS_HOURLY_RETENTION_DAYS = float(os.environ.get('SOCIAL_METRICS_HOURLY_RETENTION_DAYS', '90'))
+social_metrics = SocialMetricsStore(
+    db.social_metrics,
+    db.social_metrics_rollups,
+    hourly_retention=timedelta(days=SOCIAL_METRICS_HOURLY_RETENTION_DAYS) if SOCIAL_METRICS_HOURLY_RETENTION_DAYS > 0 else None
+)
+
+# Longest range /api/social/metrics answers, in buckets
+SOCIAL_METRICS_MAX_BUCKETS = int(os.environ.get('SOCIAL_METRICS_MAX_BUCKETS', '1000'))
+
+def social_job_upsert(user_id: str, platform: str, url: str, job_id: str) -> UpdateOne:
+    """brightdata_jobs write for a started crawl; idempotent when a user joins a crawl twice"""
+    return UpdateOne(
+        {"user_id": user_id, "job_id": job_id, "url": url},
+        {"$setOnInsert": {
+            "platform": platform,
+            "status": "running",
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }},
+        upsert=True
+    )
+
+async def start_social_crawl(user_id: str, platform: str, url: str, batched: bool = False) -> Dict:
+    """Trigger (or join) a BrightData crawl and record it in brightdata_jobs for later polling"""
+    result = await trigger_social_crawl(platform, url, batched=batched)
+    
+    if result.get("status") == "job_created":
+        await db.brightdata_jobs.bulk_write([social_job_upsert(user_id, platform, url, result["job_id"])])
+    return result
+
+async def store_job_results(job: Dict, parsed_data: Any) -> bool:
+    """
+    Mark a job completed, keep its results as the latest metrics for the platform and refresh the display
+    
+    The webhook, the poller and /job-results may complete the same snapshot at once;
+    the status change is atomic and only the caller that wins it stores the side effects.
+    
+    Returns:
+        False when the job was already finished by another caller
+    """
+    completed_at = datetime.now(timezone.utc).isoformat()
+    won = await db.brightdata_jobs.find_one_and_update(
+        {
+            "job_id": job["job_id"],
+            "user_id": job["user_id"],
+            "url": job.get("url"),
+            "status": {"$in": ["running", "ready"]}
+        },
+        {"$set": {
+            "status": "completed",
+            "results": parsed_data,
+            "completed_at": completed_at
+        }},
+        projection={"_id": 1}
+    )
+    if won is None:
+        return False
+    
+    # Empty snapshots must not overwrite the last good metrics
+    if isinstance(parsed_data, dict) and not parsed_data.get("error"):
+        if job.get("url"):
+            await social_cache.put(job["platform"], job["url"], parsed_data, job["job_id"])
+        # Ad-hoc lookups of other profiles must not change what the storefront shows
+        if await is_storefront_target(job["user_id"], job["platform"], job.get("url")):
+            await store_storefront_results(job, parsed_data, completed_at)
+    await refresh_display_snapshot(job["user_id"])
+    return True
+
+async def is_storefront_target(user_id: str, platform: str, url: Optional[str]) -> bool:
+    """Whether url is the profile configured for platform in the user's store config"""
+    if not url:
+        return False
+    config = await db.store_configs.find_one({"user_id": user_id}, {"_id": 0})
+    if not config:
+        return False
+    wanted = normalize_url(url)
+    return any(
+        target_platform == platform and normalize_url(target_url) == wanted
+        for target_platform, target_url in social_targets(config)
+    )
+
+async def store_storefront_results(job: Dict, parsed_data: Dict, completed_at: str):
+    """Keep a configured profile's results as the storefront's latest metrics and append them to its history"""
+    await db.social_latest.update_one(
+        {"user_id": job["user_id"], "platform": job["platform"]},
+        {"$set": {
+            "url": job.get("url"),
+            "job_id": job["job_id"],
+            "results": parsed_data,
+            "completed_at": completed_at
+        }},
+        upsert=True
+    )
+    try:
+        await social_metrics.record(job["user_id"], job["platform"], parsed_data)
+    except Exception as e:
+        # History is best effort; the latest results are already stored
+        logger.warning("Could not record social metrics for job %s: %s", job["job_id"], e)
+
+async def store_snapshot_results(
+    job_id: str,
+    raw_data: List[Dict],
+    reviews: Optional[Dict[Optional[str], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fan a completed snapshot out to every brightdata_jobs record sharing its id
+    
+    Args:
+        job_id: Snapshot id shared by the jobs
+        raw_data: Snapshot records
+        reviews: Per-URL review series folded while streaming (see parse_snapshot)
+    
+    Returns:
+        Dict mapping user_id to the parsed results stored for that user's job;
+        jobs already completed by a concurrent caller are left out
+    """
+    stored = {}
+    parsed_by_platform: Dict[str, Dict] = {}
+    async for job in db.brightdata_jobs.find({"job_id": job_id, "status": {"$in": ["running", "ready"]}}, {"_id": 0}):
+        # Each input of the snapshot is grouped and aggregated once, however many users share it
+        platform = job.get("platform")
+        if platform not in parsed_by_platform:
+            parsed_by_platform[platform] = parse_snapshot(platform, raw_data, reviews)
+        parsed_data = results_for_url(parsed_by_platform[platform], platform, job.get("url"))
+        if await store_job_results(job, parsed_data):
+            stored[job["user_id"]] = parsed_data
+    return stored
+
+async def complete_snapshot(job_id: str) -> Dict:
+    """
+    Download a ready snapshot and store it for every job sharing it
+    
+    Returns:
+        The get_results response, with the stored results per user under 'stored'
+    """
+    jobs = await db.brightdata_jobs.find(
+        {"job_id": job_id, "status": {"$in": ["running", "ready"]}}, {"_id": 0, "platform": 1, "url": 1}
+    ).to_list(length=None)
+    if not jobs:
+        # Already finished by another path; nothing left to download
+        return {"job_id": job_id, "status": "completed", "stored": {}}
+    
+    result = await get_brightdata_client().get_results(
+        job_id,
+        platform=jobs[0].get("platform"),
+        urls=[job["url"] for job in jobs if job.get("url")]
+    )
+    if result.get("status") == "completed":
+        # The review series are only needed for parsing and are not JSON serializable
+        reviews = result.pop("reviews", None)
+        result["stored"] = await store_snapshot_results(job_id, result.get("data", []), reviews)
+        await crawl_single_flight.release(job_id)
+    return result
+
+async def mark_snapshot_failed(job_id: str, error: str):
+    """Mark every brightdata_jobs record sharing a snapshot as failed"""
+    await db.brightdata_jobs.update_many(
+        {"job_id": job_id, "status": {"$in": ["running", "ready"]}},
+        {"$set": {
+            "status": "failed",
+            "error": error,
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        }}
+    )
+    await crawl_single_flight.release(job_id)
+
+# Background poller: completes running jobs without clients polling BrightData
+job_poller = None
+if os.environ.get('BRIGHTDATA_POLLER_ENABLED', 'true').lower() == 'true' and BRIGHTDATA_API_TOKEN:
+    job_poller = JobPoller(
+        db,
+        get_brightdata_client,
+        on_ready=complete_snapshot,
+        on_failed=mark_snapshot_failed,
+        initial_delay=float(os.environ.get('BRIGHTDATA_POLL_INITIAL_SECONDS', '5')),
+        max_delay=float(os.environ.get('BRIGHTDATA_POLL_MAX_SECONDS', '300')),
+        max_concurrency=int(os.environ.get('BRIGHTDATA_POLL_CONCURRENCY', '10')),
+        scan_interval=float(os.environ.get('BRIGHTDATA_POLL_SCAN_SECONDS', '5')),
+        max_age=timedelta(hours=float(os.environ.get('BRIGHTDATA_JOB_MAX_AGE_HOURS', '6')))
+    )
+
+# Social refresh policy: stored results older than the interval are re-crawled in the background
+SOCIAL_REFRESH_INTERVAL_HOURS = float(os.environ.get('SOCIAL_REFRESH_INTERVAL_HOURS', '24'))
+SOCIAL_REFRESH_CHECK_SECONDS = float(os.environ.get('SOCIAL_REFRESH_CHECK_SECONDS', '900'))
+SOCIAL_CONFIG_FIELDS = [
+    "instagram_url", "facebook_url", "google_maps_url",
+    "instagram_username", "facebook_page_id", "google_place_id"
+]
+
+def social_target_urls(config: Dict) -> Dict[str, str]:
+    """Normalized configured profile URL per platform"""
+    return {platform: normalize_url(url) for platform, url in social_targets(config)}
+
+async def forget_replaced_social_targets(user_id: str, previous: Dict, current: Dict):
+    """
+    Drop the stored results of platforms whose profile URL changed or was removed
+    
+    The next refresh sweep recreates the row unclaimed, so the new URL is crawled
+    then instead of after the old profile's refresh interval.
+    """
+    before = social_target_urls(previous)
+    after = social_target_urls(current)
+    replaced = [platform for platform, url in before.items() if after.get(platform) != url]
+    if replaced:
+        await db.social_latest.delete_many({"user_id": user_id, "platform": {"$in": replaced}})
+
+async def refresh_stale_social_data() -> int:
+    """Trigger crawls for configured profiles whose latest results are older than the refresh interval"""
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(hours=SOCIAL_REFRESH_INTERVAL_HOURS)).isoformat()
+    claimed_targets = []
+    
+    configs = db.store_configs.find(
+        {"$or": [{field: {"$nin": [None, ""]}} for field in SOCIAL_CONFIG_FIELDS]},
+        {"_id": 0}
+    )
+    async for config in configs:
+        for platform, url in social_targets(config):
+            key = {"user_id": config["user_id"], "platform": platform}
+            await db.social_latest.update_one(
+                key, {"$setOnInsert": {"refresh_requested_at": None}}, upsert=True
+            )
+            # Atomic claim so only one worker triggers the crawl
+            claimed = await db.social_latest.find_one_and_update(
+                {**key, "$or": [{"refresh_requested_at": None}, {"refresh_requested_at": {"$lt": cutoff}}]},
+                {"$set": {"refresh_requested_at": now.isoformat()}}
+            )
+            if claimed:
+                claimed_targets.append((config["user_id"], platform, url))
+    
+    # Submitted together so the batcher sends one trigger per dataset
+    results = await asyncio.gather(*(
+        start_social_crawl(user_id, platform, url, batched=True)
+        for user_id, platform, url in claimed_targets
+    ), return_exceptions=True)
+    
+    triggered = 0
+    for (user_id, platform, url), result in zip(claimed_targets, results):
+        if isinstance(result, dict) and result.get("status") == "job_created":
+            triggered += 1
+            continue
+        error = result if isinstance(result, Exception) else (result or {}).get("error")
+        logger.warning("Social refresh of %s %s failed: %s", platform, url, error)
+        # Release the claim so the next check retries instead of waiting a full interval
+        await db.social_latest.update_one(
+            {"user_id": user_id, "platform": platform, "refresh_requested_at": now.isoformat()},
+            {"$set": {"refresh_requested_at": None}}
+        )
+    return triggered
+
+async def social_refresh_loop():
+    while True:
+        try:
+            triggered = await refresh_stale_social_data()
+            if triggered:
+                logger.info("Social refresh triggered %d crawl jobs", triggered)
+        except Exception as e:
+            logger.warning("Social refresh failed: %s", e)
+        await asyncio.sleep(SOCIAL_REFRESH_CHECK_SECONDS)
+
+async def revalidate_social_data(user_id: str, platform: str, url: str):
+    try:
+        await start_social_crawl(user_id, platform, url)
+    except Exception as e:
+        logger.warning("Background refresh of %s %s failed: %s", platform, url, e)
+
+async def fetch_social_data(user_id: str, platform: str, url: str, background_tasks: BackgroundTasks) -> Dict:
+    """
+    Serve the cached result for a profile when usable, otherwise start (or join) a crawl
+    Stale entries are returned immediately and refreshed in the background
+    """
+    cached = await social_cache.get(platform, url)
+    if cached:
+        if cached["stale"]:
+            background_tasks.add_task(revalidate_social_data, user_id, platform, url)
+        return {
+            "status": "cached",
+            "platform": platform,
+            "data": cached["results"],
+            "fetched_at": cached["fetched_at"],
+            "stale": cached["stale"]
+        }
+    
+    result = await start_social_crawl(user_id, platform, url)
+    if result.get("status") == "job_created":
+        return {
+            "message": "Crawl job started. Check status with job_id.",
+            "job_id": result["job_id"],
+            "status": "running"
+        }
+    return result
 
 @app.get("/api/social/google-reviews")
-async def get_google_reviews(place_url: str, user_id: str = Depends(get_current_user)):
+async def get_google_reviews(place_url: str, background_tasks: BackgroundTasks, user_id: str = Depends(get_current_user)):
     """
     Get Google Maps reviews via BrightData
     Args:
@@ -229,31 +876,7 @@ async def get_google_reviews(place_url: str, user_id: str = Depends(get_current_
         return {"error": "BrightData API token not configured", "reviews": [], "rating": 0}
     
     try:
-        result = await get_social_data_via_brightdata(
-            platform="googlemaps",
-            url=place_url,
-            api_token=BRIGHTDATA_API_TOKEN,
-            params={"days_limit": 30},
-            wait_for_results=False  # Return job_id immediately
-        )
-        
-        if result.get("status") == "job_created":
-            # Store job for later polling
-            await db.brightdata_jobs.insert_one({
-                "user_id": user_id,
-                "job_id": result["job_id"],
-                "platform": "googlemaps",
-                "url": place_url,
-                "status": "running",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            })
-            return {
-                "message": "Crawl job started. Check status with job_id.",
-                "job_id": result["job_id"],
-                "status": "running"
-            }
-        else:
-            return result
+        return await fetch_social_data(user_id, "googlemaps", place_url, background_tasks)
     except Exception as e:
         return {"error": str(e), "reviews": [], "rating": 0}
 
@@ -263,20 +886,18 @@ async def get_tripadvisor_reviews(location_id: str, user_id: str = Depends(get_c
         return {"error": "TripAdvisor API key not configured", "reviews": [], "rating": 0}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.content.tripadvisor.com/api/v1/location/{location_id}/reviews",
-                headers={"accept": "application/json"},
-                params={"key": TRIPADVISOR_API_KEY, "language": "en"},
-                timeout=10.0
-            )
-            data = response.json()
-            return {"reviews": data.get("data", [])[:5], "rating": 0}  # TripAdvisor API structure
+        response = await get_tripadvisor_http().get(
+            f"https://api.content.tripadvisor.com/api/v1/location/{location_id}/reviews",
+            headers={"accept": "application/json"},
+            params={"key": TRIPADVISOR_API_KEY, "language": "en"}
+        )
+        data = response.json()
+        return {"reviews": data.get("data", [])[:5], "rating": 0}  # TripAdvisor API structure
     except Exception as e:
         return {"error": str(e), "reviews": [], "rating": 0}
 
 @app.get("/api/social/facebook-likes")
-async def get_facebook_likes(page_url: str, user_id: str = Depends(get_current_user)):
+async def get_facebook_likes(page_url: str, background_tasks: BackgroundTasks, user_id: str = Depends(get_current_user)):
     """
     Get Facebook page data via BrightData
     Args:
@@ -286,35 +907,12 @@ async def get_facebook_likes(page_url: str, user_id: str = Depends(get_current_u
         return {"error": "BrightData API token not configured", "likes": 0, "followers": 0}
     
     try:
-        result = await get_social_data_via_brightdata(
-            platform="facebook",
-            url=page_url,
-            api_token=BRIGHTDATA_API_TOKEN,
-            params={"num_of_reviews": 50},
-            wait_for_results=False
-        )
-        
-        if result.get("status") == "job_created":
-            await db.brightdata_jobs.insert_one({
-                "user_id": user_id,
-                "job_id": result["job_id"],
-                "platform": "facebook",
-                "url": page_url,
-                "status": "running",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            })
-            return {
-                "message": "Crawl job started. Check status with job_id.",
-                "job_id": result["job_id"],
-                "status": "running"
-            }
-        else:
-            return result
+        return await fetch_social_data(user_id, "facebook", page_url, background_tasks)
     except Exception as e:
         return {"error": str(e), "likes": 0, "followers": 0}
 
 @app.get("/api/social/instagram-data")
-async def get_instagram_data(profile_url: str, user_id: str = Depends(get_current_user)):
+async def get_instagram_data(profile_url: str, background_tasks: BackgroundTasks, user_id: str = Depends(get_current_user)):
     """
     Get Instagram profile data via BrightData
     Args:
@@ -324,30 +922,7 @@ async def get_instagram_data(profile_url: str, user_id: str = Depends(get_curren
         return {"error": "BrightData API token not configured", "followers": 0, "media_count": 0}
     
     try:
-        result = await get_social_data_via_brightdata(
-            platform="instagram",
-            url=profile_url,
-            api_token=BRIGHTDATA_API_TOKEN,
-            params={},
-            wait_for_results=False
-        )
-        
-        if result.get("status") == "job_created":
-            await db.brightdata_jobs.insert_one({
-                "user_id": user_id,
-                "job_id": result["job_id"],
-                "platform": "instagram",
-                "url": profile_url,
-                "status": "running",
-                "created_at": datetime.now(timezone.utc).isoformat()
-            })
-            return {
-                "message": "Crawl job started. Check status with job_id.",
-                "job_id": result["job_id"],
-                "status": "running"
-            }
-        else:
-            return result
+        return await fetch_social_data(user_id, "instagram", profile_url, background_tasks)
     except Exception as e:
         return {"error": str(e), "followers": 0, "media_count": 0}
 
@@ -359,7 +934,19 @@ async def get_brightdata_job_status(job_id: str, user_id: str = Depends(get_curr
         raise HTTPException(status_code=500, detail="BrightData API token not configured")
     
     try:
-        client = BrightDataClient(BRIGHTDATA_API_TOKEN)
+        # The background poller keeps brightdata_jobs current, so answer from the database
+        if job_poller is not None:
+            job = await db.brightdata_jobs.find_one({"job_id": job_id, "user_id": user_id}, {"_id": 0})
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return {
+                "job_id": job_id,
+                "status": job.get("status"),
+                "progress": job.get("progress", 0),
+                "error": job.get("error")
+            }
+        
+        client = get_brightdata_client()
         status = await client.check_job_status(job_id)
         
         # Update job status in database
@@ -369,6 +956,8 @@ async def get_brightdata_job_status(job_id: str, user_id: str = Depends(get_curr
         )
         
         return status
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -384,61 +973,221 @@ async def get_brightdata_job_results(job_id: str, user_id: str = Depends(get_cur
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        client = BrightDataClient(BRIGHTDATA_API_TOKEN)
-        result = await client.get_results(job_id)
+        # Already fetched by the poller (or an earlier call)
+        if job.get("status") == "completed" and "results" in job:
+            return {
+                "status": "success",
+                "platform": job.get("platform"),
+                "data": job["results"],
+                "job_id": job_id
+            }
+        
+        # Parse and store results for every job sharing this snapshot
+        result = await complete_snapshot(job_id)
         
         if result.get("status") == "completed":
-            # Parse data based on platform
-            platform = job.get("platform")
-            raw_data = result.get("data", [])
-            
-            from brightdata_integration import PARSERS
-            parser = PARSERS.get(platform)
-            
-            if parser:
-                parsed_data = parser(raw_data)
-            else:
-                parsed_data = raw_data
-            
-            # Update job status and store results
-            await db.brightdata_jobs.update_one(
-                {"job_id": job_id},
-                {"$set": {
-                    "status": "completed",
-                    "results": parsed_data,
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }}
-            )
-            
+            data = result["stored"].get(user_id)
+            if data is None:
+                # Completed concurrently by the poller or the webhook
+                stored_job = await db.brightdata_jobs.find_one(
+                    {"job_id": job_id, "user_id": user_id}, {"_id": 0, "results": 1}
+                )
+                data = (stored_job or {}).get("results")
             return {
                 "status": "success",
-                "platform": platform,
-                "data": parsed_data,
+                "platform": job.get("platform"),
+                "data": data,
                 "job_id": job_id
             }
         else:
             return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/brightdata/my-jobs")
-async def get_my_brightdata_jobs(user_id: str = Depends(get_current_user)):
-    """Get all BrightData jobs for the current user"""
+# How long the webhook holds the poll lease while it downloads a notified snapshot
+WEBHOOK_COMPLETION_LEASE_SECONDS = 120
+
+async def complete_notified_snapshot(job_id: str, status_value: str, error: Optional[str] = None):
+    """Finish a snapshot reported by a BrightData notification (polling stays as fallback)"""
+    # Hold the poller's lease so the poller does not download the same snapshot meanwhile
+    if job_poller is not None and not await job_poller.claim(job_id, WEBHOOK_COMPLETION_LEASE_SECONDS):
+        return  # The poller is on it
     try:
-        jobs = await db.brightdata_jobs.find(
-            {"user_id": user_id},
-            {"_id": 0}
-        ).sort("created_at", -1).limit(20).to_list(length=20)
-        
-        return {"jobs": jobs}
+        if status_value == "ready":
+            result = await complete_snapshot(job_id)
+            if result.get("status") != "completed":
+                logger.warning("Notified snapshot %s not retrievable: %s", job_id, result.get("error"))
+                return  # The lease expires and the poller retries
+        elif status_value == "failed":
+            await mark_snapshot_failed(job_id, error or "Crawl failed")
+        if job_poller is not None:
+            await job_poller.release(job_id)
+    except Exception as e:
+        logger.warning("Completing notified snapshot %s failed: %s", job_id, e)
+
+def verify_brightdata_webhook(authorization: Optional[str] = Header(None)):
+    if not BRIGHTDATA_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="BrightData webhook not configured")
+    
+    token = (authorization or "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(token.encode(), BRIGHTDATA_WEBHOOK_SECRET.encode()):
+        raise HTTPException(status_code=401, detail="Invalid webhook credentials")
+
+@app.post("/api/brightdata/webhook", dependencies=[Depends(verify_brightdata_webhook)])
+async def brightdata_webhook(notification: Dict[str, Any], background_tasks: BackgroundTasks):
+    """
+    Completion notification sent by BrightData when a snapshot is ready
+    Expects {"snapshot_id": "...", "status": "ready" | "failed"}
+    """
+    job_id = notification.get("snapshot_id")
+    status_value = notification.get("status")
+    if not job_id or not status_value:
+        raise HTTPException(status_code=400, detail="snapshot_id and status are required")
+    
+    job = await db.brightdata_jobs.find_one(
+        {"job_id": job_id, "status": {"$in": ["running", "ready"]}}, {"_id": 0, "job_id": 1}
+    )
+    if not job:
+        return {"status": "ignored", "job_id": job_id}
+    
+    # Acknowledge immediately; the snapshot is downloaded and parsed after the response
+    background_tasks.add_task(complete_notified_snapshot, job_id, status_value, notification.get("error"))
+    return {"status": "accepted", "job_id": job_id}
+
+class JobsResponse(BaseModel):
+    jobs: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+MY_JOBS_MAX_LIMIT = 100
+
+def encode_jobs_cursor(job: Dict) -> str:
+    """Opaque keyset cursor: the (created_at, job_id) of the last job on a page"""
+    raw = json.dumps([job.get("created_at"), job.get("job_id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_jobs_cursor(cursor: str) -> tuple:
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, job_id
+
+@app.get("/api/brightdata/my-jobs", response_model=JobsResponse)
+async def get_my_brightdata_jobs(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    platform: Optional[str] = None,
+    status_value: Optional[str] = Query(None, alias="status"),
+    include_results: bool = False,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Page through the current user's BrightData jobs, newest first
+    Args:
+        limit: Jobs per page (at most 100)
+        cursor: next_cursor of the previous page
+        platform, status: Optional filters
+        include_results: Include the parsed results of each job (left out by default)
+    """
+    limit = max(1, min(limit, MY_JOBS_MAX_LIMIT))
+    query: Dict[str, Any] = {"user_id": user_id}
+    if platform:
+        query["platform"] = platform
+    if status_value:
+        query["status"] = status_value
+    if cursor:
+        # Keyset: strictly after the last (created_at, job_id) seen, so each page is one index range
+        created_at, job_id = decode_jobs_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "job_id": {"$lt": job_id}}
+        ]
+    
+    projection = {"_id": 0} if include_results else {"_id": 0, "results": 0}
+    try:
+        jobs = await db.brightdata_jobs.find(query, projection).sort(
+            [("created_at", -1), ("job_id", -1)]
+        ).limit(limit + 1).to_list(length=limit + 1)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    next_cursor = encode_jobs_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+    return {"jobs": jobs[:limit], "next_cursor": next_cursor}
+
+GRANULARITY_STEPS = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+# Default range per granularity when start is omitted
+DEFAULT_METRICS_RANGE = {"hour": timedelta(hours=48), "day": timedelta(days=30), "week": timedelta(weeks=26)}
+
+@app.get("/api/social/metrics")
+async def get_social_metrics(
+    granularity: str = "day",
+    platform: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Metric history of the current user's social profiles, read from the pre-aggregated rollups
+    Args:
+        granularity: hour, day or week
+        platform: instagram, facebook or googlemaps (comma-separated for several); all when omitted
+        start, end: ISO datetimes; end defaults to now, start to a granularity-dependent range
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}")
+    
+    end = end or datetime.now(timezone.utc)
+    start = start or end - DEFAULT_METRICS_RANGE[granularity]
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if (end - bucket_start(start, granularity)) / GRANULARITY_STEPS[granularity] > SOCIAL_METRICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {SOCIAL_METRICS_MAX_BUCKETS} {granularity} buckets"
+        )
+    
+    platforms = [p.strip() for p in platform.split(",") if p.strip()] if platform else None
+    return {
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "series": await social_metrics.series(user_id, granularity, start, end, platforms)
+    }
+
+# Bounded fan-out for refresh-all: platforms are triggered concurrently, each isolated by its own timeout
+SOCIAL_TRIGGER_CONCURRENCY = int(os.environ.get('SOCIAL_TRIGGER_CONCURRENCY', '8'))
+SOCIAL_TRIGGER_TIMEOUT_SECONDS = float(os.environ.get('SOCIAL_TRIGGER_TIMEOUT_SECONDS', '20'))
+social_trigger_semaphore = asyncio.Semaphore(SOCIAL_TRIGGER_CONCURRENCY)
+
+async def trigger_platform_crawl(platform: str, url: str) -> Dict:
+    """Trigger one platform crawl without recording it; failures are returned, never raised"""
+    try:
+        async with social_trigger_semaphore:
+            result = await asyncio.wait_for(
+                trigger_social_crawl(platform, url),
+                timeout=SOCIAL_TRIGGER_TIMEOUT_SECONDS
+            )
+    except asyncio.TimeoutError:
+        return {"platform": platform, "status": "failed", "error": f"Trigger timed out after {SOCIAL_TRIGGER_TIMEOUT_SECONDS}s"}
+    except Exception as e:
+        return {"platform": platform, "status": "failed", "error": str(e)}
+    
+    if result.get("status") == "job_created":
+        return {"platform": platform, "status": "running", "job_id": result["job_id"], "url": url}
+    return {"platform": platform, "status": "failed", "error": result.get("error", "Crawl could not be started")}
 
 @app.post("/api/brightdata/refresh-all-social")
 async def refresh_all_social_data(user_id: str = Depends(get_current_user)):
     """
     Trigger crawl jobs for all configured social platforms
-    Returns job_ids for tracking
+    Returns job_ids for tracking, plus the platforms that could not be started
     """
     if not BRIGHTDATA_API_TOKEN:
         raise HTTPException(status_code=500, detail="BrightData API token not configured")
@@ -449,72 +1198,189 @@ async def refresh_all_social_data(user_id: str = Depends(get_current_user)):
         if not config:
             raise HTTPException(status_code=404, detail="Store configuration not found")
         
-        jobs = []
+        outcomes = await asyncio.gather(*(
+            trigger_platform_crawl(platform, url) for platform, url in social_targets(config)
+        ))
+        started = [outcome for outcome in outcomes if outcome["status"] == "running"]
+        failed = [outcome for outcome in outcomes if outcome["status"] == "failed"]
         
-        # Trigger Instagram crawl
-        if config.get("instagram_url"):
-            result = await get_social_data_via_brightdata(
-                platform="instagram",
-                url=config["instagram_url"],
-                api_token=BRIGHTDATA_API_TOKEN,
-                wait_for_results=False
-            )
-            if result.get("status") == "job_created":
-                jobs.append({"platform": "instagram", "job_id": result["job_id"]})
-        
-        # Trigger Facebook crawl
-        if config.get("facebook_url"):
-            result = await get_social_data_via_brightdata(
-                platform="facebook",
-                url=config["facebook_url"],
-                api_token=BRIGHTDATA_API_TOKEN,
-                params={"num_of_reviews": 50},
-                wait_for_results=False
-            )
-            if result.get("status") == "job_created":
-                jobs.append({"platform": "facebook", "job_id": result["job_id"]})
-        
-        # Trigger Google Maps crawl
-        if config.get("google_maps_url"):
-            result = await get_social_data_via_brightdata(
-                platform="googlemaps",
-                url=config["google_maps_url"],
-                api_token=BRIGHTDATA_API_TOKEN,
-                params={"days_limit": 30},
-                wait_for_results=False
-            )
-            if result.get("status") == "job_created":
-                jobs.append({"platform": "googlemaps", "job_id": result["job_id"]})
+        # Record all started jobs in a single bulk write
+        if started:
+            await db.brightdata_jobs.bulk_write([
+                social_job_upsert(user_id, outcome["platform"], outcome["url"], outcome["job_id"])
+                for outcome in started
+            ])
         
         return {
-            "message": f"Started {len(jobs)} crawl jobs",
-            "jobs": jobs
+            "message": f"Started {len(started)} crawl jobs",
+            "jobs": [{"platform": outcome["platform"], "job_id": outcome["job_id"]} for outcome in started],
+            "failed": [{"platform": outcome["platform"], "error": outcome["error"]} for outcome in failed],
+            "partial": bool(started) and bool(failed)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    except Exception as e:
-        return {"error": str(e), "followers": 0, "media_count": 0}
-
 # AI - Sustainability Index Calculation
+SUSTAINABILITY_MODEL = ("gemini", "gemini-2.0-flash")
+SUSTAINABILITY_CACHE_TTL_HOURS = float(os.environ.get('SUSTAINABILITY_CACHE_TTL_HOURS', '720'))
+
+def sustainability_input_hash(request: SustainabilityRequest) -> str:
+    """Content address of an assessment: normalized inputs plus the model that produced it"""
+    def normalize(value: Optional[str]) -> str:
+        return " ".join((value or "").split()).lower()
+    
+    identity = json.dumps({
+        "business_name": normalize(request.business_name),
+        "business_type": normalize(request.business_type),
+        "description": normalize(request.description),
+        "model": "/".join(SUSTAINABILITY_MODEL)
+    }, sort_keys=True)
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+async def cached_sustainability(user_id: str, input_hash: str) -> Optional[Dict]:
+    """Reuse a recent assessment with the same inputs, recording it for this user if needed"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=SUSTAINABILITY_CACHE_TTL_HOURS)).isoformat()
+    cached = await db.sustainability_assessments.find_one(
+        {"input_hash": input_hash, "created_at": {"$gte": cutoff}},
+        {"_id": 0},
+        sort=[("created_at", -1)]
+    )
+    if not cached:
+        return None
+    
+    # The display shows the user's latest assessment, so make this one the latest
+    latest = await db.sustainability_assessments.find_one(
+        {"user_id": user_id}, {"_id": 0, "input_hash": 1}, sort=[("created_at", -1)]
+    )
+    if not latest or latest.get("input_hash") != input_hash:
+        await db.sustainability_assessments.insert_one({
+            **cached,
+            "user_id": user_id,
+            "cached_from": cached["created_at"],
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        await refresh_display_snapshot(user_id)
+    return cached["result"]
+
+async def save_sustainability(user_id: str, request: SustainabilityRequest, input_hash: str, result: Dict):
+    sustainability_data = {
+        "user_id": user_id,
+        "business_name": request.business_name,
+        "business_type": request.business_type,
+        "input_hash": input_hash,
+        "model": "/".join(SUSTAINABILITY_MODEL),
+        "result": result,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    await db.sustainability_assessments.insert_one(sustainability_data)
+    await refresh_display_snapshot(user_id)
+
 @app.post("/api/sustainability/calculate")
 async def calculate_sustainability(request: SustainabilityRequest, user_id: str = Depends(get_current_user)):
     if not GEMINI_API_KEY and not EMERGENT_LLM_KEY:
         raise HTTPException(status_code=500, detail="Gemini API key not configured")
     
     try:
-        # Use Gemini AI to calculate sustainability index
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
+        input_hash = sustainability_input_hash(request)
+        if not request.force_refresh:
+            cached = await cached_sustainability(user_id, input_hash)
+            if cached is not None:
+                return cached
         
-        api_key = EMERGENT_LLM_KEY if EMERGENT_LLM_KEY else GEMINI_API_KEY
+        # Identical prompts already running share one model call
+        result = await llm_scheduler.submit(
+            user_id, lambda: assess_sustainability(request, user_id), key=input_hash
+        )
+        await save_sustainability(user_id, request, input_hash, result)
         
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=f"sustainability-{user_id}-{uuid.uuid4()}",
-            system_message="You are a sustainability expert. Analyze businesses and provide sustainability scores."
-        ).with_model("gemini", "gemini-2.0-flash")
+        return result
         
-        prompt = f"""
+    except LlmBusy as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error calculating sustainability: {str(e)}")
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/sustainability/calculate/stream")
+async def stream_sustainability(request: SustainabilityRequest, user_id: str = Depends(get_current_user)):
+    """
+    Server-sent events variant of /api/sustainability/calculate
+
+    Events: `token` (raw reply text), `field` (a top-level field as soon as its
+    value is complete), then `result` with the whole assessment, or `error`.
+    """
+    if not GEMINI_API_KEY and not EMERGENT_LLM_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API key not configured")
+    
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    input_hash = sustainability_input_hash(request)
+    if not request.force_refresh:
+        cached = await cached_sustainability(user_id, input_hash)
+        if cached is not None:
+            async def replay():
+                for name, value in cached.items():
+                    yield sse_event("field", {"name": name, "value": value})
+                yield sse_event("result", cached)
+            return StreamingResponse(replay(), media_type="text/event-stream", headers=headers)
+    
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def call():
+        await events.put(None)  # Got a slot; the response can start
+        started, outcome = time.perf_counter(), "error"
+        try:
+            parser = JsonFieldStream()
+            async for text in stream_sustainability_text(request, user_id):
+                await events.put(sse_event("token", {"text": text}))
+                for name, value in parser.feed(text):
+                    await events.put(sse_event("field", {"name": name, "value": value}))
+            result = parser.result()
+            outcome = "ok"
+            return result
+        finally:
+            llm_call_seconds.observe(time.perf_counter() - started, "stream", outcome)
+    
+    async def run():
+        # Not tied to the response, so a client that disconnects still gets its assessment saved
+        result = await llm_scheduler.submit(user_id, call)
+        await save_sustainability(user_id, request, input_hash, result)
+        return result
+    
+    task = asyncio.create_task(run())
+    started = asyncio.create_task(events.get())
+    await asyncio.wait({task, started}, return_when=asyncio.FIRST_COMPLETED)
+    if not started.done():
+        started.cancel()
+        try:
+            task.result()
+        except LlmBusy as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error calculating sustainability: {str(e)}")
+    
+    async def relay():
+        while not (task.done() and events.empty()):
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+        try:
+            yield sse_event("result", task.result())
+        except Exception as e:
+            yield sse_event("error", {"detail": f"Error calculating sustainability: {str(e)}"})
+    
+    return StreamingResponse(relay(), media_type="text/event-stream", headers=headers)
+
+SUSTAINABILITY_SYSTEM_MESSAGE = "You are a sustainability expert. Analyze businesses and provide sustainability scores."
+
+def sustainability_prompt(request: SustainabilityRequest) -> str:
+    return f"""
 Analyze the following business and provide a sustainability assessment:
 
 Business Name: {request.business_name}
@@ -533,44 +1399,65 @@ Provide a JSON response with the following structure:
 
 Be realistic and provide actionable insights.
 """
-        
-        user_message = UserMessage(text=prompt)
+
+def sustainability_api_key() -> str:
+    """
+    Key used for assessments: the Emergent universal key when set, else GEMINI_API_KEY
+    
+    Both endpoints follow this order so an input_hash cache entry always comes from the same provider.
+    """
+    return EMERGENT_LLM_KEY or GEMINI_API_KEY
+
+async def assess_sustainability(request: SustainabilityRequest, user_id: str) -> Dict:
+    """Ask Gemini for a sustainability assessment and parse its JSON answer"""
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    
+    chat = LlmChat(
+        api_key=sustainability_api_key(),
+        session_id=f"sustainability-{user_id}-{uuid.uuid4()}",
+        system_message=SUSTAINABILITY_SYSTEM_MESSAGE
+    ).with_model(*SUSTAINABILITY_MODEL)
+    
+    user_message = UserMessage(text=sustainability_prompt(request))
+    started, outcome = time.perf_counter(), "error"
+    try:
         response = await chat.send_message(user_message)
-        
-        # Parse JSON from response
-        import json
-        import re
-        
-        # Extract JSON from markdown code blocks if present
-        json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try to find JSON object directly
-            json_match = re.search(r'{.*}', response, re.DOTALL)
-            json_str = json_match.group(0) if json_match else response
-        
-        result = json.loads(json_str)
-        
-        # Save to database
-        sustainability_data = {
-            "user_id": user_id,
-            "business_name": request.business_name,
-            "business_type": request.business_type,
-            "result": result,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.sustainability_assessments.insert_one(sustainability_data)
-        
+        # First complete JSON object, whether fenced in markdown or surrounded by prose
+        result = extract_json_object(response)
+        outcome = "ok"
         return result
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating sustainability: {str(e)}")
+    finally:
+        llm_call_seconds.observe(time.perf_counter() - started, "complete", outcome)
+
+async def stream_sustainability_text(request: SustainabilityRequest, user_id: str):
+    """
+    Yield the assessment reply as it is generated
+
+    Streams straight from the Gemini API when GEMINI_API_KEY is the key in use
+    (see sustainability_api_key); the Emergent universal key only supports whole
+    replies, which are yielded at once.
+    """
+    api_key = sustainability_api_key()
+    if not EMERGENT_LLM_KEY:
+        async for text in stream_generate(
+            get_gemini_http(), api_key, SUSTAINABILITY_MODEL[1],
+            SUSTAINABILITY_SYSTEM_MESSAGE, sustainability_prompt(request)
+        ):
+            yield text
+        return
+    
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    
+    chat = LlmChat(
+        api_key=api_key,
+        session_id=f"sustainability-{user_id}-{uuid.uuid4()}",
+        system_message=SUSTAINABILITY_SYSTEM_MESSAGE
+    ).with_model(*SUSTAINABILITY_MODEL)
+    yield await chat.send_message(UserMessage(text=sustainability_prompt(request)))
 
 # Display Preview Endpoint
-@app.get("/api/display/{user_id}")
-async def get_display_data(user_id: str):
-    """Public endpoint to get display data for storefront"""
+async def build_display_data(user_id: str) -> Dict:
+    """Assemble the storefront payload from users, store_configs and sustainability_assessments"""
     user = await db.users.find_one({"id": user_id}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -586,29 +1473,172 @@ async def get_display_data(user_id: str):
         sort=[("created_at", -1)]
     )
     
-    # Aggregate social data if configured
+    # Latest stored social results (crawls are triggered by the refresh policy, never by a view)
     social_data = {}
-    
-    if config.get("google_place_id"):
-        google_data = await get_google_reviews(config["google_place_id"], user_id)
-        social_data["google"] = google_data
-    
-    if config.get("facebook_page_id"):
-        fb_data = await get_facebook_likes(config["facebook_page_id"], user_id)
-        social_data["facebook"] = fb_data
-    
-    if config.get("instagram_username"):
-        ig_data = await get_instagram_data(config["instagram_username"], user_id)
-        social_data["instagram"] = ig_data
+    customer_satisfaction = {}
+    show_satisfaction = config.get("show_customer_satisfaction_chart", True)
+    target_urls = social_target_urls(config)
+    async for latest in db.social_latest.find({"user_id": user_id, "results": {"$ne": None}}, {"_id": 0}):
+        # Rows left over from a previously configured profile are not shown
+        if target_urls.get(latest["platform"]) != normalize_url(latest.get("url") or ""):
+            continue
+        key = DISPLAY_SOCIAL_KEYS.get(latest["platform"], latest["platform"])
+        results = dict(latest["results"])
+        # Review aggregates feed the satisfaction chart rather than the social cards
+        satisfaction = results.pop("satisfaction", None)
+        if satisfaction and show_satisfaction:
+            customer_satisfaction[key] = satisfaction
+        social_data[key] = {**results, "updated_at": latest.get("completed_at")}
     
     return {
         "business_name": user["business_name"],
         "config": config,
         "sustainability": sustainability.get("result") if sustainability else None,
-        "social_data": social_data
+        "social_data": social_data,
+        "customer_satisfaction": customer_satisfaction
     }
 
+display_cache = DisplaySnapshotCache(
+    db.display_snapshots,
+    build_display_data,
+    maxsize=int(os.environ.get('DISPLAY_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('DISPLAY_CACHE_TTL', '30'))
+)
+
+# Screens subscribed to /api/display/{user_id}/events on this worker
+display_broker = DisplayBroker(
+    db.display_snapshots,
+    cache=display_cache,
+    poll_interval=float(os.environ.get('DISPLAY_PUSH_POLL_SECONDS', '2'))
+)
+DISPLAY_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('DISPLAY_STREAM_HEARTBEAT_SECONDS', '15'))
+DISPLAY_STREAM_RETRY_MS = int(os.environ.get('DISPLAY_STREAM_RETRY_MS', '3000'))
+
+async def refresh_display_snapshot(user_id: str):
+    """Rebuild a user's display snapshot after one of its inputs changed"""
+    try:
+        snapshot = await display_cache.rebuild(user_id)
+        display_broker.publish(user_id, snapshot)
+    except Exception as e:
+        logger.warning("Display snapshot rebuild failed for %s: %s", user_id, e)
+        await display_cache.invalidate(user_id)
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, as RFC 9110 asks for GET"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+@app.get("/api/display/{user_id}")
+async def get_display_data(
+    user_id: str,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None)
+):
+    """Public endpoint to get display data for storefront"""
+    snapshot = await display_cache.get(user_id)
+    
+    etag = f'"{snapshot["etag"]}"'
+    modified_at = datetime.fromisoformat(snapshot["modified_at"])
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(modified_at, usegmt=True),
+        # Screens may keep a copy but must revalidate it on every poll
+        "Cache-Control": "no-cache"
+    }
+    
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    elif if_modified_since is not None:
+        try:
+            not_modified = modified_at.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            not_modified = False
+    else:
+        not_modified = False
+    
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(snapshot["payload"], headers=headers)
+
+@app.get("/api/display/{user_id}/events")
+async def stream_display_data(
+    user_id: str,
+    version: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-sent events feed of a storefront's display payload
+
+    Sends a `display` event (id = payload etag) now unless the screen already
+    has that version, then again whenever the payload changes. Reconnecting
+    screens resume through Last-Event-ID, or ?version=<etag>.
+    """
+    known = last_event_id or version
+    queue = display_broker.subscribe(user_id, known)
+    try:
+        current = await display_cache.get(user_id)
+    except BaseException:
+        display_broker.unsubscribe(user_id, queue)
+        raise
+    
+    async def events():
+        sent = known
+        snapshot = current
+        try:
+            yield f"retry: {DISPLAY_STREAM_RETRY_MS}\n\n"
+            while snapshot is not None:
+                if snapshot["etag"] != sent:
+                    yield f"id: {snapshot['etag']}\nevent: display\ndata: {json.dumps(snapshot['payload'])}\n\n"
+                    sent = snapshot["etag"]
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), DISPLAY_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                    snapshot = {"etag": sent}
+        finally:
+            display_broker.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Metrics
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+def internal_queue_depths() -> Dict:
+    depths = {
+        ("crawl_batcher",): crawl_batcher.pending_count,
+        ("password_hashing",): password_hasher.queue_depth,
+        ("llm_scheduler",): llm_scheduler.queue_depth
+    }
+    if job_poller is not None:
+        depths[("job_poller",)] = job_poller.tracked_count
+    return depths
+
+metrics_registry.gauge("internal_queue_depth", "Work waiting in in-process queues", internal_queue_depths, ["queue"])
+metrics_registry.gauge("llm_calls_running", "LLM calls holding a scheduler slot", lambda: {(): llm_scheduler.stats()["running"]})
+metrics_registry.gauge("display_stream_subscribers", "Open display event streams", lambda: {(): display_broker.subscriber_count})
+metrics_registry.gauge("verified_token_cache_entries", "JWTs in the verified-token cache", lambda: {(): len(token_cache)})
+
+@app.get("/api/metrics", include_in_schema=False)
+async def get_metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text exposition of this worker's metrics"""
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Health check
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "password_hashing": password_hasher.stats(),
+        "llm": llm_scheduler.stats(),
+        "display_subscribers": display_broker.subscriber_count
+    }
@@ -0,0 +1,132 @@
+"""
+Crawl Single-Flight for Look@Me CMS
+Deduplicates in-flight BrightData crawls of the same (platform, url, params)
+across requests and uvicorn workers
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from brightdata_integration import normalize_url
+
+
+def crawl_key(platform: str, url: str, params: Optional[Dict] = None) -> str:
+    """Stable identity of a crawl: platform, normalized URL and parameters"""
+    identity = json.dumps([platform, normalize_url(url), params or {}], sort_keys=True)
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class CrawlSingleFlight:
+    """
+    Returns the job_id of the running crawl instead of starting a duplicate
+
+    Each running crawl holds a claim document in the brightdata_inflight
+    collection. A unique index on `key`, partial on status 'running' (declared
+    in indexes.py), makes the claim atomic across workers; the claim is
+    released when its snapshot completes or fails, and released claims are
+    removed by a TTL index on released_at.
+    """
+
+    def __init__(
+        self,
+        collection,
+        claim_timeout: float = 30.0,
+        max_age: timedelta = timedelta(hours=6),
+        wait_interval: float = 0.2
+    ):
+        """
+        Args:
+            collection: Motor collection holding the claims
+            claim_timeout: Seconds a claim may stay without a job_id before it is
+                considered abandoned (worker died while triggering)
+            max_age: How long a running crawl is shared before a new one may start
+            wait_interval: Delay between checks while another worker is triggering
+        """
+        self.collection = collection
+        self.claim_timeout = claim_timeout
+        self.max_age = max_age
+        self.wait_interval = wait_interval
+
+    async def run(
+        self,
+        platform: str,
+        url: str,
+        params: Optional[Dict],
+        trigger: Callable[[], Awaitable[Dict]]
+    ) -> Dict:
+        """
+        Start a crawl through `trigger` unless the same crawl is already running
+
+        Returns:
+            The trigger result, or a 'job_created' result carrying the job_id of
+            the running crawl (with deduplicated=True)
+        """
+        key = crawl_key(platform, url, params)
+
+        while True:
+            now = datetime.now(timezone.utc)
+            claim = {
+                "key": key,
+                "platform": platform,
+                "url": normalize_url(url),
+                "params": params or {},
+                "status": "running",
+                "job_id": None,
+                "claimed_at": now,
+                "expires_at": now + timedelta(seconds=self.claim_timeout)
+            }
+            try:
+                await self.collection.insert_one(claim)
+            except DuplicateKeyError:
+                existing = await self.collection.find_one({"key": key, "status": "running"})
+                if existing is None:
+                    continue  # Finished in the meantime; claim again
+
+                expires_at = existing["expires_at"]
+                if expires_at.tzinfo is None:
+                    expires_at = expires_at.replace(tzinfo=timezone.utc)
+                if expires_at < now:
+                    await self.collection.update_one(
+                        {"_id": existing["_id"], "status": "running"},
+                        {"$set": {"status": "abandoned", "released_at": now}}
+                    )
+                    continue
+
+                if existing.get("job_id"):
+                    return {
+                        "status": "job_created",
+                        "job_id": existing["job_id"],
+                        "message": f"Crawl job already running for {platform}. Check status with job_id.",
+                        "deduplicated": True
+                    }
+
+                # Another request is triggering this crawl right now
+                await asyncio.sleep(self.wait_interval)
+                continue
+
+            try:
+                result = await trigger()
+            except BaseException:
+                await self.collection.delete_one({"_id": claim["_id"]})
+                raise
+
+            if result.get("status") == "job_created":
+                await self.collection.update_one(
+                    {"_id": claim["_id"]},
+                    {"$set": {"job_id": result["job_id"], "expires_at": now + self.max_age}}
+                )
+            else:
+                await self.collection.delete_one({"_id": claim["_id"]})
+            return result
+
+    async def release(self, job_id: str):
+        """Free the claims of a finished snapshot so the next request starts a fresh crawl"""
+        await self.collection.update_many(
+            {"job_id": job_id, "status": "running"},
+            {"$set": {"status": "done", "released_at": datetime.now(timezone.utc)}}
+        )
@@ -0,0 +1,85 @@
+"""
+Social Results Cache for Look@Me CMS
+Latest parsed crawl result per (platform, normalized url), served while fresh and
+with stale-while-revalidate after the platform's max-age
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from brightdata_integration import normalize_url
+from single_flight import crawl_key
+
+# Follower counts and ratings move slowly; per-platform max-age before a re-crawl
+DEFAULT_MAX_AGE = {
+    "instagram": timedelta(hours=6),
+    "facebook": timedelta(hours=12),
+    "googlemaps": timedelta(hours=24)
+}
+
+
+class SocialResultsCache:
+    """
+    Freshness-aware cache of parsed social results stored in MongoDB
+
+    get() classifies an entry as fresh (younger than the platform max-age),
+    stale (served, but the caller should refresh it in the background) or
+    expired (older than max-age + stale_window, treated as a miss).
+    """
+
+    def __init__(
+        self,
+        collection,
+        max_age: Optional[Dict[str, timedelta]] = None,
+        stale_window: timedelta = timedelta(hours=72)
+    ):
+        """
+        Args:
+            collection: Motor collection holding the cache entries
+            max_age: Per-platform freshness; defaults to DEFAULT_MAX_AGE
+            stale_window: How long after max-age a stale entry may still be served
+        """
+        self.collection = collection
+        self.max_age = {**DEFAULT_MAX_AGE, **(max_age or {})}
+        self.stale_window = stale_window
+
+    async def get(self, platform: str, url: str) -> Optional[Dict]:
+        """
+        Returns:
+            Dict with results, fetched_at and stale flag, or None on a miss
+        """
+        entry = await self.collection.find_one({"key": crawl_key(platform, url)}, {"_id": 0})
+        if not entry:
+            return None
+
+        fetched_at = entry["fetched_at"]
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        age = datetime.now(timezone.utc) - fetched_at
+        max_age = self.max_age.get(platform, timedelta(hours=24))
+        if age > max_age + self.stale_window:
+            return None
+
+        return {
+            "results": entry["results"],
+            "fetched_at": fetched_at.isoformat(),
+            "stale": age > max_age
+        }
+
+    async def put(self, platform: str, url: str, results: Dict, job_id: Optional[str] = None):
+        """Store the latest parsed result for a URL"""
+        fetched_at = datetime.now(timezone.utc)
+        max_age = self.max_age.get(platform, timedelta(hours=24))
+        await self.collection.update_one(
+            {"key": crawl_key(platform, url)},
+            {"$set": {
+                "platform": platform,
+                "url": normalize_url(url),
+                "results": results,
+                "job_id": job_id,
+                "fetched_at": fetched_at,
+                # Lets a TTL index drop entries that can no longer be served
+                "expires_at": fetched_at + max_age + self.stale_window
+            }},
+            upsert=True
+        )
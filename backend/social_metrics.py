@@ -0,0 +1,169 @@
+"""
+Social Metrics History for Look@Me CMS
+Appends the numeric metrics of every completed crawl to a MongoDB time-series
+collection and maintains hourly, daily and weekly rollups at write time, so
+charts read pre-aggregated buckets instead of raw job documents
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+GRANULARITIES = ("hour", "day", "week")
+
+
+def extract_metrics(results: Dict) -> Dict[str, float]:
+    """Numeric top-level fields of a parsed result, plus the review aggregate when present"""
+    metrics = {
+        name: float(value) for name, value in results.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+    satisfaction = results.get("satisfaction")
+    if isinstance(satisfaction, dict):
+        for name in ("mean_rating", "reviews_analyzed"):
+            if isinstance(satisfaction.get(name), (int, float)):
+                metrics[f"satisfaction_{name}"] = float(satisfaction[name])
+    return metrics
+
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    """Start of the UTC hour, day or week (Monday) containing `at`"""
+    at = at.astimezone(timezone.utc) if at.tzinfo else at.replace(tzinfo=timezone.utc)
+    if granularity == "hour":
+        return at.replace(minute=0, second=0, microsecond=0)
+    day = at.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown granularity {granularity!r}")
+
+
+def _utc(value: datetime) -> datetime:
+    # Mongo returns naive UTC datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class SocialMetricsStore:
+    """
+    Metric history per (user, platform)
+
+    record() inserts one raw point and upserts the matching hour, day and week
+    buckets (point count; count, sum, min, max and last per metric) in a
+    single bulk write.
+    series() answers a range query from the buckets of one granularity.
+    """
+
+    def __init__(self, points, rollups, hourly_retention: Optional[timedelta] = timedelta(days=90)):
+        """
+        Args:
+            points: Motor collection receiving raw points (a time-series collection)
+            rollups: Motor collection holding the pre-aggregated buckets
+            hourly_retention: Hourly buckets expire this long after they start
+                (TTL on expires_at); None keeps them forever. Daily and weekly
+                buckets are always kept.
+        """
+        self.points = points
+        self.rollups = rollups
+        self.hourly_retention = hourly_retention
+
+    async def record(self, user_id: str, platform: str, results: Dict, at: Optional[datetime] = None) -> bool:
+        """
+        Append the metrics of one completed crawl
+
+        Returns:
+            False when the results carry no numeric metric
+        """
+        metrics = extract_metrics(results)
+        if not metrics:
+            return False
+
+        at = at or datetime.now(timezone.utc)
+        await self.points.insert_one({
+            "ts": at,
+            "meta": {"user_id": user_id, "platform": platform},
+            "metrics": metrics
+        })
+
+        operations = []
+        for granularity in GRANULARITIES:
+            start = bucket_start(at, granularity)
+            update = {
+                "$inc": {
+                    "count": 1,
+                    **{f"sum.{name}": value for name, value in metrics.items()},
+                    **{f"n.{name}": 1 for name in metrics}
+                },
+                "$min": {f"min.{name}": value for name, value in metrics.items()},
+                "$max": {f"max.{name}": value for name, value in metrics.items()},
+                "$set": {"last_at": at, **{f"last.{name}": value for name, value in metrics.items()}}
+            }
+            if granularity == "hour" and self.hourly_retention is not None:
+                update["$set"]["expires_at"] = start + self.hourly_retention
+            operations.append(UpdateOne(
+                {"user_id": user_id, "platform": platform, "granularity": granularity, "bucket_start": start},
+                update,
+                upsert=True
+            ))
+
+        try:
+            await self.rollups.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Two workers upserting a new bucket at once: the loser retries as an update
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            retry = [operations[error["index"]] for error in e.details["writeErrors"]]
+            await self.rollups.bulk_write(retry, ordered=False)
+        return True
+
+    async def series(
+        self,
+        user_id: str,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        platforms: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Chart-ready series for a time range
+
+        Returns:
+            Dict mapping platform to {"buckets": [bucket starts],
+            "count": [...], "metrics": {name: {"avg", "min", "max", "last": [...]}}};
+            metric lists are aligned with buckets and hold None where a bucket
+            lacks that metric
+        """
+        query = {
+            "user_id": user_id,
+            "granularity": granularity,
+            "bucket_start": {"$gte": bucket_start(start, granularity), "$lte": end}
+        }
+        if platforms:
+            query["platform"] = {"$in": list(platforms)}
+
+        by_platform: Dict[str, List[Dict]] = {}
+        async for bucket in self.rollups.find(query, {"_id": 0}).sort([("platform", 1), ("bucket_start", 1)]):
+            by_platform.setdefault(bucket["platform"], []).append(bucket)
+
+        series = {}
+        for platform, buckets in by_platform.items():
+            names = sorted({name for bucket in buckets for name in bucket.get("sum", {})})
+            metrics = {name: {"avg": [], "min": [], "max": [], "last": []} for name in names}
+            for bucket in buckets:
+                for name in names:
+                    if name in bucket.get("sum", {}):
+                        metrics[name]["avg"].append(round(bucket["sum"][name] / bucket["n"][name], 4))
+                        metrics[name]["min"].append(bucket["min"][name])
+                        metrics[name]["max"].append(bucket["max"][name])
+                        metrics[name]["last"].append(bucket["last"][name])
+                    else:
+                        for values in metrics[name].values():
+                            values.append(None)
+            series[platform] = {
+                "buckets": [_utc(bucket["bucket_start"]).isoformat() for bucket in buckets],
+                "count": [bucket["count"] for bucket in buckets],
+                "metrics": metrics
+            }
+        return series
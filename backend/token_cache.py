@@ -0,0 +1,71 @@
+"""
+Verified Token Cache for Look@Me CMS
+Bounded LRU of recently verified JWTs, so repeated requests with the same token
+skip decoding and HMAC verification, plus an optional revocation list
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def token_digest(token: str) -> str:
+    """Cache key for a token; the raw token is never kept in memory longer than needed"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    LRU of token digest -> (user_id, exp)
+
+    Entries are dropped at the token's own `exp`, when evicted by size, or when
+    the token is revoked. A maxsize of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[str]:
+        """Return the user_id of a verified, unexpired token, or None"""
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        user_id, exp = entry
+        if exp <= time.time():
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return user_id
+
+    def put(self, token: str, user_id: str, exp: float):
+        if self.maxsize <= 0:
+            return
+        digest = token_digest(token)
+        if digest in self._revoked:
+            return
+        self._entries[digest] = (user_id, exp)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def revoke(self, digest: str, exp: float):
+        """Invalidate a token (by digest) until it would have expired anyway"""
+        self._entries.pop(digest, None)
+        self._revoked[digest] = exp
+
+    def is_revoked(self, token: str) -> bool:
+        return token_digest(token) in self._revoked
+
+    def prune(self):
+        """Forget revocations of tokens that have expired"""
+        now = time.time()
+        for digest in [d for d, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[digest]
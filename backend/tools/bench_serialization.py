@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Serialization and compression microbenchmark
+Compares how display and my-jobs payloads are rendered: the previous
+jsonable_encoder + stdlib json path, orjson, and response_model serialization
+by pydantic-core, then the size and cost of gzip/brotli on the result
+
+Usage (from backend/):
+    python -m tools.bench_serialization [--iterations 500] [--jobs 20] [--reviews 50]
+"""
+
+import argparse
+import json
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+import compression
+import server
+
+
+def display_payload() -> dict:
+    return {
+        "business_name": "Caffè Centrale",
+        "config": {
+            **server.StoreConfig(user_id=str(uuid.uuid4())).model_dump(),
+            "amenities": ["Wi-Fi", "Dog friendly", "Outdoor seating", "Vegan options"],
+            "recognitions": [{"name": f"Certification {i}", "icon_url": f"https://cdn.example.com/{i}.png"} for i in range(5)]
+        },
+        "sustainability": {
+            "sustainability_index": 72,
+            "environmental_score": 68,
+            "social_score": 77,
+            "recommendations": [f"Recommendation number {i} with some explanatory text" for i in range(5)],
+            "strengths": ["Local suppliers", "Reusable cups"],
+            "areas_for_improvement": ["Energy mix", "Food waste"]
+        },
+        "social": {
+            "instagram": {"followers": 12840, "posts": 412, "engagement_rate": 3.1},
+            "facebook": {"likes": 5310, "rating": 4.6, "reviews_count": 220},
+            "google": {"rating": 4.5, "reviews_count": 1380}
+        }
+    }
+
+
+def jobs_payload(jobs: int, reviews: int) -> dict:
+    now = datetime.now(timezone.utc)
+    return {"jobs": [
+        {
+            "job_id": f"s_{uuid.uuid4().hex[:16]}",
+            "user_id": "bench-user",
+            "platform": "googlemaps",
+            "url": "https://www.google.com/maps/place/Caffe+Centrale",
+            "status": "completed",
+            "created_at": (now - timedelta(hours=i)).isoformat(),
+            "completed_at": now - timedelta(hours=i, minutes=-3),
+            "results": {
+                "rating": 4.5,
+                "reviews_count": 1380,
+                "reviews": [
+                    {
+                        "author": f"Reviewer {r}",
+                        "rating": 1 + r % 5,
+                        "text": "Great coffee and friendly staff, will definitely come back again. " * 2,
+                        "date": (now - timedelta(days=r)).isoformat()
+                    }
+                    for r in range(reviews)
+                ]
+            }
+        }
+        for i in range(jobs)
+    ]}
+
+
+def per_call_us(fn, iterations: int) -> float:
+    fn()  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round((time.perf_counter() - started) / iterations * 1e6, 1)
+
+
+def measure(payload: dict, iterations: int, model=None) -> dict:
+    results = {
+        "stdlib_us": per_call_us(lambda: JSONResponse(jsonable_encoder(payload)).body, iterations),
+        "orjson_us": per_call_us(lambda: ORJSONResponse(jsonable_encoder(payload)).body, iterations),
+        "orjson_direct_us": per_call_us(lambda: ORJSONResponse(payload).body, iterations)
+    }
+    if model is not None:
+        adapter = TypeAdapter(model)
+        results["response_model_us"] = per_call_us(
+            lambda: ORJSONResponse(adapter.dump_python(adapter.validate_python(payload), mode="json")).body,
+            iterations
+        )
+
+    body = ORJSONResponse(payload).body
+    results["bytes"] = len(body)
+    results["gzip_bytes"] = len(zlib.compress(body, 6, zlib.MAX_WBITS | 16))
+    results["gzip_us"] = per_call_us(lambda: zlib.compress(body, 6, zlib.MAX_WBITS | 16), iterations)
+    if compression.BROTLI_AVAILABLE:
+        results["brotli_bytes"] = len(compression.brotli.compress(body, quality=4))
+        results["brotli_us"] = per_call_us(lambda: compression.brotli.compress(body, quality=4), iterations)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization and compression")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--reviews", type=int, default=50)
+    args = parser.parse_args()
+
+    print(json.dumps({
+        "iterations": args.iterations,
+        "display": measure(display_payload(), args.iterations),
+        "my_jobs": measure(jobs_payload(args.jobs, args.reviews), args.iterations, server.JobsResponse)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+BrightData simulator
+Local stand-in for the datasets v3 API used by BrightDataClient (/trigger,
+/progress/{id}, /snapshot/{id}) with configurable job duration, response
+latency, snapshot size, completion notifications and 429/5xx/timeout injection
+
+Usage (from backend/):
+    python -m tools.brightdata_sim [--port 8900] [--job-duration uniform:5:20]
+        [--latency lognormal:80:0.5] [--records-per-input 50] [--rate-limit-rate 0.05]
+        [--server-error-rate 0.02] [--timeout-rate 0.01] [--fail-rate 0.05]
+
+then start the backend with BRIGHTDATA_BASE_URL=http://localhost:8900/datasets/v3.
+create_app() can also be mounted in-process through httpx.ASGITransport.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from brightdata_integration import BrightDataClient
+
+# dataset_id -> platform, as configured in BrightDataClient
+DATASETS = {dataset_id: platform for platform, dataset_id in BrightDataClient("").dataset_ids.items()}
+
+
+class Distribution:
+    """
+    Random durations from a spec string, in seconds unless scale says otherwise
+
+    const:X, uniform:A:B, or lognormal:MEDIAN:SIGMA
+    """
+
+    def __init__(self, spec: str, scale: float = 1.0):
+        kind, *values = spec.split(":")
+        numbers = [float(v) for v in values]
+        if kind not in ("const", "uniform", "lognormal") or len(numbers) != {"const": 1, "uniform": 2, "lognormal": 2}[kind]:
+            raise ValueError(f"Invalid distribution {spec!r}; use const:X, uniform:A:B or lognormal:MEDIAN:SIGMA")
+        self.spec = spec
+        self.kind = kind
+        if kind == "lognormal":
+            self.numbers = [numbers[0] * scale, numbers[1]]  # sigma is unitless
+        else:
+            self.numbers = [n * scale for n in numbers]
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "const":
+            return self.numbers[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.numbers)
+        median, sigma = self.numbers
+        return median * rng.lognormvariate(0, sigma)
+
+
+@dataclass
+class SimulatorConfig:
+    job_duration: Distribution = field(default_factory=lambda: Distribution("uniform:2:10"))
+    latency: Distribution = field(default_factory=lambda: Distribution("const:0"))
+    records_per_input: int = 20
+    review_chars: int = 200
+    rate_limit_rate: float = 0.0     # Share of calls answered 429
+    server_error_rate: float = 0.0   # Share of calls answered 500/502/503
+    timeout_rate: float = 0.0        # Share of calls that hang, then answer 504
+    hang_seconds: float = 35.0
+    fail_rate: float = 0.0           # Share of jobs ending as 'failed'
+    token: Optional[str] = None      # When set, the Authorization bearer must match
+    seed: Optional[int] = None
+
+
+class SimulatedJob:
+    def __init__(self, snapshot_id: str, platform: str, inputs: List[Dict], ready_at: float, fails: bool):
+        self.snapshot_id = snapshot_id
+        self.platform = platform
+        self.inputs = inputs
+        self.ready_at = ready_at
+        self.fails = fails
+        self.records: Optional[List[Dict]] = None
+
+    @property
+    def status(self) -> str:
+        if time.monotonic() < self.ready_at:
+            return "running"
+        return "failed" if self.fails else "ready"
+
+
+def build_records(job: SimulatedJob, config: SimulatorConfig, rng: random.Random) -> List[Dict]:
+    """One row per review, each carrying the profile-level fields the parsers read"""
+    now = datetime.now(timezone.utc)
+    words = ["great", "coffee", "friendly", "staff", "slow", "service", "clean", "cozy", "pricey", "tasty"]
+    records = []
+    for entry in job.inputs:
+        url = entry.get("url", "")
+        rating = round(rng.uniform(3.2, 4.9), 1)
+        profile = {
+            "input": entry,
+            "url": url,
+            "name": f"Simulated place {zlib.crc32(url.encode()) % 1000}",
+            "rating": rating,
+            "reviews_count": rng.randint(config.records_per_input, config.records_per_input * 20),
+            "fans_count": rng.randint(100, 50000),
+            "followers_count": rng.randint(100, 50000),
+            "posts_count": rng.randint(10, 2000),
+            "username": url.rstrip("/").rsplit("/", 1)[-1],
+            "address": "Via Roma 1, Milano"
+        }
+        for _ in range(config.records_per_input):
+            text = []
+            while sum(len(w) + 1 for w in text) < config.review_chars:
+                text.append(rng.choice(words))
+            records.append({
+                **profile,
+                "review_id": uuid.uuid4().hex,
+                "review_rating": max(1, min(5, round(rng.gauss(rating, 1.0)))),
+                "review_text": " ".join(text),
+                "review_date": (now - timedelta(days=rng.uniform(0, 90))).isoformat(),
+                "reviewer_name": f"Reviewer {rng.randint(1, 10000)}"
+            })
+    return records
+
+
+def create_app(config: Optional[SimulatorConfig] = None) -> FastAPI:
+    config = config or SimulatorConfig()
+    rng = random.Random(config.seed)
+    jobs: Dict[str, SimulatedJob] = {}
+    notifier = httpx.AsyncClient(timeout=10.0)
+    background = set()
+    stats = {"trigger": 0, "progress": 0, "snapshot": 0, "injected_429": 0, "injected_5xx": 0, "injected_timeout": 0, "notified": 0}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        for task in background:
+            task.cancel()
+        await notifier.aclose()
+
+    app = FastAPI(title="BrightData simulator", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def latency_and_faults(request: Request, call_next):
+        if request.url.path.startswith("/sim/"):
+            return await call_next(request)
+
+        if config.token and request.headers.get("authorization") != f"Bearer {config.token}":
+            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+
+        await asyncio.sleep(config.latency.sample(rng))
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            stats["injected_429"] += 1
+            return JSONResponse({"error": "Too many requests"}, status_code=429, headers={"Retry-After": "1"})
+        roll -= config.rate_limit_rate
+        if roll < config.server_error_rate:
+            stats["injected_5xx"] += 1
+            return JSONResponse({"error": "Internal error"}, status_code=rng.choice([500, 502, 503]))
+        roll -= config.server_error_rate
+        if roll < config.timeout_rate:
+            stats["injected_timeout"] += 1
+            await asyncio.sleep(config.hang_seconds)
+            return JSONResponse({"error": "Gateway timeout"}, status_code=504)
+        return await call_next(request)
+
+    async def send_notification(job: SimulatedJob, url: str, auth_header: Optional[str]):
+        await asyncio.sleep(max(0.0, job.ready_at - time.monotonic()))
+        headers = {"Authorization": auth_header} if auth_header else {}
+        try:
+            await notifier.post(url, json={"snapshot_id": job.snapshot_id, "status": job.status}, headers=headers)
+            stats["notified"] += 1
+        except httpx.HTTPError:
+            pass  # BrightData does not retry either; polling remains the fallback
+
+    @app.post("/datasets/v3/trigger")
+    async def trigger(request: Request, dataset_id: str, notify: Optional[str] = None, auth_header: Optional[str] = None):
+        stats["trigger"] += 1
+        if dataset_id not in DATASETS:
+            return JSONResponse({"error": f"Unknown dataset {dataset_id}"}, status_code=400)
+        inputs = await request.json()
+        if not isinstance(inputs, list) or not inputs:
+            return JSONResponse({"error": "Body must be a non-empty list of inputs"}, status_code=400)
+
+        job = SimulatedJob(
+            snapshot_id=f"s_sim{uuid.uuid4().hex[:14]}",
+            platform=DATASETS[dataset_id],
+            inputs=inputs,
+            ready_at=time.monotonic() + config.job_duration.sample(rng),
+            fails=rng.random() < config.fail_rate
+        )
+        jobs[job.snapshot_id] = job
+
+        if notify:
+            task = asyncio.create_task(send_notification(job, notify, auth_header))
+            background.add(task)
+            task.add_done_callback(background.discard)
+        return {"snapshot_id": job.snapshot_id}
+
+    @app.get("/datasets/v3/progress/{snapshot_id}")
+    async def progress(snapshot_id: str):
+        stats["progress"] += 1
+        job = jobs.get(snapshot_id)
+        if job is None:
+            return JSONResponse({"error": "Snapshot not found"}, status_code=404)
+        body = {"snapshot_id": snapshot_id, "dataset_id": job.platform, "status": job.status}
+        if job.status == "ready":
+            body["records"] = len(job.inputs) * config.records_per_input
+        return body
+
+    @app.get("/datasets/v3/snapshot/{snapshot_id}")
+    async def snapshot(snapshot_id: str, format: str = "json"):
+        stats["snapshot"] += 1
+        job = jobs.get(snapshot_id)
+        if job is None:
+            return JSONResponse({"error": "Snapshot not found"}, status_code=404)
+        if job.status == "running":
+            return JSONResponse({"status": "building", "message": "Snapshot is not ready yet, try again in 10s"}, status_code=202)
+        if job.status == "failed":
+            return JSONResponse({"error": "Snapshot failed"}, status_code=400)
+
+        if job.records is None:
+            job.records = build_records(job, config, rng)
+        if format == "ndjson":
+            async def lines():
+                for record in job.records:
+                    yield json.dumps(record) + "\n"
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+        return Response(json.dumps(job.records), media_type="application/json")
+
+    @app.get("/sim/stats")
+    async def simulator_stats():
+        by_status: Dict[str, int] = {}
+        for job in jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {**stats, "jobs": by_status}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local BrightData datasets API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--job-duration", default="uniform:2:10", help="Seconds until a snapshot is ready")
+    parser.add_argument("--latency", default="const:0", help="Milliseconds added to every response")
+    parser.add_argument("--records-per-input", type=int, default=20, help="Snapshot rows per crawled URL")
+    parser.add_argument("--review-chars", type=int, default=200, help="Approximate review text length")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=35.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--token", help="Require this bearer token")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = SimulatorConfig(
+        job_duration=Distribution(args.job_duration),
+        latency=Distribution(args.latency, scale=0.001),
+        records_per_input=args.records_per_input,
+        review_chars=args.review_chars,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        fail_rate=args.fail_rate,
+        token=args.token,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Fake BrightData notifier
+Posts a snapshot completion notification to a local Look@Me webhook, the same
+way BrightData does when a trigger was sent with a notify URL
+
+Usage:
+    python tools/fake_notifier.py <snapshot_id> [--status ready|failed]
+        [--url http://localhost:8001/api/brightdata/webhook] [--secret $BRIGHTDATA_WEBHOOK_SECRET]
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Dict, Optional
+
+import httpx
+
+DEFAULT_WEBHOOK_URL = "http://localhost:8001/api/brightdata/webhook"
+
+
+async def send_notification(
+    webhook_url: str,
+    snapshot_id: str,
+    secret: str,
+    status: str = "ready",
+    error: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None
+) -> httpx.Response:
+    """
+    Deliver one completion notification
+
+    Args:
+        webhook_url: Receiver URL (the BRIGHTDATA_NOTIFY_URL of the backend)
+        snapshot_id: Snapshot the notification is about
+        secret: Shared webhook secret, sent as a Bearer Authorization header
+        status: 'ready' or 'failed'
+        error: Optional error message for failed snapshots
+        client: AsyncClient to use (e.g. one bound to an in-process ASGI app)
+    """
+    payload: Dict = {"snapshot_id": snapshot_id, "status": status}
+    if error:
+        payload["error"] = error
+    headers = {"Authorization": f"Bearer {secret}"}
+
+    if client is not None:
+        return await client.post(webhook_url, json=payload, headers=headers)
+    async with httpx.AsyncClient(timeout=10.0) as owned_client:
+        return await owned_client.post(webhook_url, json=payload, headers=headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a fake BrightData snapshot notification")
+    parser.add_argument("snapshot_id")
+    parser.add_argument("--status", default="ready", choices=["ready", "failed"])
+    parser.add_argument("--error")
+    parser.add_argument("--url", default=os.environ.get("BRIGHTDATA_NOTIFY_URL") or DEFAULT_WEBHOOK_URL)
+    parser.add_argument("--secret", default=os.environ.get("BRIGHTDATA_WEBHOOK_SECRET", ""))
+    args = parser.parse_args()
+
+    response = asyncio.run(send_notification(args.url, args.snapshot_id, args.secret, args.status, args.error))
+    print(f"{response.status_code} {response.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Load and latency benchmark
+Drives a realistic request mix (logins, store config reads and writes, display
+polls, job endpoints, sustainability calculations) against the backend and
+reports throughput and p50/p95/p99 latency per operation as JSON
+
+The app runs in-process through ASGITransport (default) or under a local
+uvicorn started by the benchmark (--uvicorn). Both use a local MongoDB and a
+throwaway database; BrightData and the LLM are faked in-process, so no network
+access or API keys are needed.
+
+Usage (from backend/, with MongoDB on MONGO_URL or localhost:27017):
+    python -m tools.load_bench [--duration 30] [--concurrency 50] [--users 20]
+        [--mix display=20,config_read=5,...] [--uvicorn [--workers 2]] [--output run.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import httpx
+
+DEFAULT_MIX = {
+    "display": 20,
+    "config_read": 5,
+    "config_write": 1,
+    "my_jobs": 3,
+    "job_status": 3,
+    "job_results": 2,
+    "login": 1,
+    "sustainability": 0.5
+}
+
+PASSWORD = "bench-password"
+
+
+def configure_environment(args):
+    """Point the app at a throwaway database and keep background work out of the way"""
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    os.environ.setdefault("BRIGHTDATA_API_TOKEN", "bench-token")
+    # Job status is answered from the database, as in production with the poller on
+    os.environ.setdefault("BRIGHTDATA_POLLER_ENABLED", "true")
+    os.environ["SOCIAL_REFRESH_INTERVAL_HOURS"] = "0"
+
+
+def fake_brightdata(request: httpx.Request) -> httpx.Response:
+    """Every snapshot is ready at once with one small record per URL"""
+    path = request.url.path
+    if "/trigger" in path:
+        return httpx.Response(200, json={"snapshot_id": f"s_{uuid.uuid4().hex[:16]}"})
+    if "/progress/" in path:
+        return httpx.Response(200, json={"status": "ready", "records": 1})
+    if "/snapshot/" in path:
+        record = {"input": {"url": "https://www.google.com/maps/place/bench"}, "rating": 4.5, "reviews_count": 120}
+        return httpx.Response(200, text=json.dumps(record) + "\n")
+    return httpx.Response(404)
+
+
+def install_fakes(server, llm_latency: float):
+    from brightdata_integration import BrightDataClient
+
+    server.brightdata_client = BrightDataClient(
+        os.environ["BRIGHTDATA_API_TOKEN"],
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(fake_brightdata)),
+        stream_snapshots=True
+    )
+
+    async def fake_assessment(request, user_id):
+        await asyncio.sleep(llm_latency)
+        return {
+            "sustainability_index": 70,
+            "environmental_score": 65,
+            "social_score": 75,
+            "recommendations": ["Switch to renewable energy", "Reduce packaging"],
+            "strengths": ["Local suppliers"],
+            "areas_for_improvement": ["Food waste"]
+        }
+
+    server.GEMINI_API_KEY = server.GEMINI_API_KEY or "bench-key"
+    server.assess_sustainability = fake_assessment
+
+
+async def setup_users(client: httpx.AsyncClient, db, count: int) -> List[Dict]:
+    users = []
+    run_id = uuid.uuid4().hex[:8]
+    for i in range(count):
+        username = f"bench-{run_id}-{i}"
+        response = await client.post("/api/auth/register", json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": PASSWORD,
+            "business_name": f"Bench Business {i}"
+        })
+        response.raise_for_status()
+        data = response.json()
+        users.append({"username": username, "token": data["token"], "user_id": data["user"]["id"], "etag": None})
+
+    # Completed jobs with parsed results, as left behind by the poller
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for user in users:
+        user["job_ids"] = []
+        for j in range(10):
+            job_id = f"s_bench{uuid.uuid4().hex[:12]}"
+            user["job_ids"].append(job_id)
+            jobs.append({
+                "job_id": job_id,
+                "user_id": user["user_id"],
+                "platform": "googlemaps",
+                "url": "https://www.google.com/maps/place/bench",
+                "status": "completed",
+                "created_at": (now - timedelta(hours=j)).isoformat(),
+                "completed_at": (now - timedelta(hours=j)).isoformat(),
+                "results": {"rating": 4.5, "reviews_count": 120, "reviews": [
+                    {"author": f"Reviewer {r}", "rating": 1 + r % 5, "text": "Great place, friendly staff."}
+                    for r in range(20)
+                ]}
+            })
+    await db.brightdata_jobs.insert_many(jobs)
+    return users
+
+
+def auth(user: Dict) -> Dict:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+
+async def op_login(client, user, rng):
+    response = await client.post("/api/auth/login", json={"username": user["username"], "password": PASSWORD})
+    return response.status_code
+
+
+async def op_config_read(client, user, rng):
+    return (await client.get("/api/store/config", headers=auth(user))).status_code
+
+
+async def op_config_write(client, user, rng):
+    response = await client.put("/api/store/config", headers=auth(user), json={
+        "mission_statement": f"Serving good coffee since {rng.randint(1950, 2020)}"
+    })
+    return response.status_code
+
+
+async def op_display(client, user, rng):
+    # Screens keep the last ETag and revalidate it on every poll
+    headers = {"If-None-Match": user["etag"]} if user["etag"] else {}
+    response = await client.get(f"/api/display/{user['user_id']}", headers=headers)
+    if response.status_code == 200:
+        user["etag"] = response.headers.get("etag")
+    return response.status_code
+
+
+async def op_my_jobs(client, user, rng):
+    return (await client.get("/api/brightdata/my-jobs", headers=auth(user))).status_code
+
+
+async def op_job_status(client, user, rng):
+    job_id = rng.choice(user["job_ids"])
+    return (await client.get(f"/api/brightdata/job-status/{job_id}", headers=auth(user))).status_code
+
+
+async def op_job_results(client, user, rng):
+    job_id = rng.choice(user["job_ids"])
+    return (await client.get(f"/api/brightdata/job-results/{job_id}", headers=auth(user))).status_code
+
+
+async def op_sustainability(client, user, rng):
+    # A handful of descriptions, so the assessment cache sees both hits and misses
+    response = await client.post("/api/sustainability/calculate", headers=auth(user), json={
+        "business_name": "Bench Business",
+        "business_type": "Cafe",
+        "description": f"Variant {rng.randint(0, 9)}"
+    })
+    return response.status_code
+
+
+OPERATIONS = {
+    "login": op_login,
+    "config_read": op_config_read,
+    "config_write": op_config_write,
+    "display": op_display,
+    "my_jobs": op_my_jobs,
+    "job_status": op_job_status,
+    "job_results": op_job_results,
+    "sustainability": op_sustainability
+}
+
+
+async def virtual_user(client, users, mix: Dict[str, float], until: float, samples, seed: int):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < until:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            status = await OPERATIONS[name](client, rng.choice(users), rng)
+        except Exception as e:
+            status = type(e).__name__
+        if samples is not None:
+            samples.setdefault(name, []).append((time.perf_counter() - started, status))
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: Dict[str, List[Tuple[float, object]]], elapsed: float) -> Dict:
+    operations = {}
+    total_requests = total_errors = 0
+    for name, entries in sorted(samples.items()):
+        latencies = sorted(seconds for seconds, _ in entries)
+        statuses: Dict[str, int] = {}
+        for _, status in entries:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        errors = sum(1 for _, status in entries if not isinstance(status, int) or status >= 400)
+        total_requests += len(entries)
+        total_errors += errors
+        operations[name] = {
+            "requests": len(entries),
+            "errors": errors,
+            "throughput_rps": round(len(entries) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+            "statuses": statuses
+        }
+    return {
+        "requests": total_requests,
+        "errors": total_errors,
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "operations": operations
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def drive(client: httpx.AsyncClient, db, args, mix: Dict[str, float]) -> Dict:
+    users = await setup_users(client, db, args.users)
+
+    if args.warmup > 0:
+        until = time.perf_counter() + args.warmup
+        await asyncio.gather(*[
+            virtual_user(client, users, mix, until, None, args.seed + i) for i in range(args.concurrency)
+        ])
+
+    samples: Dict[str, list] = {}
+    started = time.perf_counter()
+    until = started + args.duration
+    await asyncio.gather(*[
+        virtual_user(client, users, mix, until, samples, args.seed + 1000 + i) for i in range(args.concurrency)
+    ])
+    return summarize(samples, time.perf_counter() - started)
+
+
+async def run_in_process(args, mix: Dict[str, float]) -> Dict:
+    import server
+
+    install_fakes(server, args.llm_latency)
+    async with server.app.router.lifespan_context(server.app):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+            try:
+                return await drive(client, server.db, args, mix)
+            finally:
+                if not args.keep_db:
+                    await server.client.drop_database(args.db_name)
+
+
+async def run_uvicorn(args, mix: Dict[str, float]) -> Dict:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        env=os.environ.copy()
+    )
+    mongo = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+            for _ in range(150):
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.2)
+            else:
+                raise RuntimeError("uvicorn did not become healthy")
+            return await drive(client, mongo[args.db_name], args, mix)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        if not args.keep_db:
+            await mongo.drop_database(args.db_name)
+        mongo.close()
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r} (known: {', '.join(OPERATIONS)})")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and latency benchmark for the Look@Me backend")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--users", type=int, default=20, help="Registered accounts shared by virtual users")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="Operation weights overriding the defaults, e.g. display=50,login=0")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="Seconds the fake LLM takes per call")
+    parser.add_argument("--uvicorn", action="store_true", help="Run the app under a local uvicorn instead of in-process")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db-name", default=f"lookatme_bench_{os.getpid()}")
+    parser.add_argument("--keep-db", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    configure_environment(args)
+    started_at = datetime.now(timezone.utc).isoformat()
+    mix = args.mix
+    if args.uvicorn:
+        # The fake LLM cannot be patched into a separate process
+        mix.pop("sustainability", None)
+        results = asyncio.run(run_uvicorn(args, mix))
+    else:
+        results = asyncio.run(run_in_process(args, mix))
+
+    report = {
+        "commit": git_commit(),
+        "started_at": started_at,
+        "mode": "uvicorn" if args.uvicorn else "in-process",
+        "workers": args.workers if args.uvicorn else 1,
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "mix": mix,
+        **results
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ function App() {
   const [previewMode, setPreviewMode] = useState(false);
   const [sustainabilityData, setSustainabilityData] = useState(null);
   const [socialData, setSocialData] = useState({});
+  const [customerSatisfaction, setCustomerSatisfaction] = useState({});
 
   // Login/Register states
   const [loginData, setLoginData] = useState({ username: '', password: '' });
@@ -154,7 +155,7 @@ function App() {
     setLoading(true);
     const token = localStorage.getItem('token');
     try {
-      const response = await fetch(`${API_URL}/api/sustainability/calculate`, {
+      const response = await fetch(`${API_URL}/api/sustainability/calculate/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -166,13 +167,37 @@ function App() {
           description: config?.mission_statement || ''
         })
       });
-      if (response.ok) {
-        const data = await response.json();
-        setSustainabilityData(data);
-        alert('✅ Indice di sostenibilità calcolato!');
-      } else {
+      if (!response.ok) {
         alert('❌ Errore nel calcolo della sostenibilità');
+        setLoading(false);
+        return;
       }
+
+      // Server-sent events: show each field as soon as it is complete
+      setSustainabilityData({});
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let failed = false;
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          const event = raw.match(/^event: (.*)$/m)?.[1];
+          const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || 'null');
+          if (event === 'field') {
+            setSustainabilityData(prev => ({ ...prev, [data.name]: data.value }));
+          } else if (event === 'result') {
+            setSustainabilityData(data);
+          } else if (event === 'error') {
+            failed = true;
+          }
+        }
+      }
+      alert(failed ? '❌ Errore nel calcolo della sostenibilità' : '✅ Indice di sostenibilità calcolato!');
     } catch (error) {
       alert('Errore: ' + error.message);
     }
@@ -217,6 +242,15 @@ function App() {
         }
       }
 
+      // Review aggregates stored from the configured profiles (same payload the storefront renders)
+      if (user?.id) {
+        const res = await fetch(`${API_URL}/api/display/${user.id}`);
+        if (res.ok) {
+          const display = await res.json();
+          setCustomerSatisfaction(display.customer_satisfaction || {});
+        }
+      }
+
       setPreviewMode(true);
     } catch (error) {
       console.error('Error loading preview:', error);
@@ -378,6 +412,35 @@ function App() {
                 </div>
               )}
 
+              {/* Customer Satisfaction Chart */}
+              {config?.show_customer_satisfaction_chart && (customerSatisfaction.google || customerSatisfaction.facebook) && (() => {
+                const satisfaction = customerSatisfaction.google || customerSatisfaction.facebook;
+                const maxCount = Math.max(1, ...Object.values(satisfaction.rating_distribution));
+                return (
+                  <div className="bg-gray-800 rounded-xl p-6">
+                    <h3 className="text-2xl font-bold mb-4 text-yellow-400">CUSTOMER SATISFACTION</h3>
+                    <p className="text-4xl font-bold">{satisfaction.mean_rating}/5</p>
+                    <p className="text-sm text-gray-400 mb-4">
+                      {satisfaction.reviews_analyzed} recensioni · {satisfaction.trend_per_week >= 0 ? '▲' : '▼'} {Math.abs(satisfaction.trend_per_week)} a settimana
+                    </p>
+                    <div className="space-y-1">
+                      {['5', '4', '3', '2', '1'].map(star => (
+                        <div key={star} className="flex items-center gap-2 text-sm">
+                          <span className="w-6">{star}★</span>
+                          <div className="flex-1 bg-gray-700 rounded h-3">
+                            <div
+                              className="bg-yellow-400 h-3 rounded"
+                              style={{ width: `${(satisfaction.rating_distribution[star] / maxCount) * 100}%` }}
+                            />
+                          </div>
+                          <span className="w-8 text-right text-gray-400">{satisfaction.rating_distribution[star]}</span>
+                        </div>
+                      ))}
+                    </div>
+                  </div>
+                );
+              })()}
+
               {/* Sustainability Index */}
               {config?.show_sustainability_index && sustainabilityData && (
                 <div className="bg-gray-800 rounded-xl p-6">
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: backend modules are imported the way server.py imports
+them (flat, from backend/)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
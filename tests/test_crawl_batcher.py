@@ -0,0 +1,170 @@
+"""
+Tests for crawl_batcher.CrawlBatcher with a stub BrightData client
+"""
+
+import asyncio
+
+from crawl_batcher import CrawlBatcher
+
+
+class StubClient:
+    """Records trigger_batch calls; optionally fails or blocks them"""
+
+    def __init__(self, error=None, result=None):
+        self.calls = []
+        self.error = error
+        self.result = result
+        self.release = None
+
+    async def trigger_batch(self, platform, entries):
+        self.calls.append((platform, entries))
+        if self.release is not None:
+            await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result or {"status": "triggered", "job_id": f"s_{platform}_{len(self.calls)}"}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_requests_within_the_window_share_one_trigger_per_platform():
+    async def scenario():
+        client = StubClient()
+        batcher = CrawlBatcher(lambda: client, window=0.05)
+        results = await asyncio.gather(
+            batcher.submit("instagram", "https://instagram.com/a"),
+            batcher.submit("instagram", "https://instagram.com/b", {"days_limit": 30}),
+            batcher.submit("facebook", "https://facebook.com/a")
+        )
+
+        assert sorted(platform for platform, _ in client.calls) == ["facebook", "instagram"]
+        instagram_entries = dict(client.calls)["instagram"]
+        assert instagram_entries == [
+            {"url": "https://instagram.com/a"},
+            {"url": "https://instagram.com/b", "days_limit": 30}
+        ]
+        assert [result["status"] for result in results] == ["job_created"] * 3
+        assert results[0]["job_id"] == results[1]["job_id"] != results[2]["job_id"]
+        assert batcher.pending_count == 0
+
+    run(scenario())
+
+
+def test_nothing_is_triggered_before_the_window_ends():
+    async def scenario():
+        client = StubClient()
+        batcher = CrawlBatcher(lambda: client, window=0.2)
+        pending = asyncio.create_task(batcher.submit("instagram", "https://instagram.com/a"))
+        await asyncio.sleep(0.05)
+        assert client.calls == []
+        assert batcher.pending_count == 1
+
+        assert (await pending)["status"] == "job_created"
+        assert len(client.calls) == 1
+
+    run(scenario())
+
+
+def test_requests_after_a_flush_start_a_new_batch():
+    async def scenario():
+        client = StubClient()
+        batcher = CrawlBatcher(lambda: client, window=0.02)
+        first = await batcher.submit("instagram", "https://instagram.com/a")
+        second = await batcher.submit("instagram", "https://instagram.com/b")
+        assert len(client.calls) == 2
+        assert first["job_id"] != second["job_id"]
+
+    run(scenario())
+
+
+def test_max_batch_flushes_early():
+    async def scenario():
+        client = StubClient()
+        batcher = CrawlBatcher(lambda: client, window=60, max_batch=3)
+        results = await asyncio.wait_for(asyncio.gather(*(
+            batcher.submit("googlemaps", f"https://maps.google.com/place/{i}") for i in range(3)
+        )), timeout=1)
+
+        assert len(client.calls) == 1
+        assert len(client.calls[0][1]) == 3
+        assert len({result["job_id"] for result in results}) == 1
+        assert "googlemaps" not in batcher._timers  # The window timer was cancelled
+
+    run(scenario())
+
+
+def test_duplicate_entries_are_sent_once_and_all_callers_answered():
+    async def scenario():
+        client = StubClient()
+        batcher = CrawlBatcher(lambda: client, window=0.02)
+        results = await asyncio.gather(
+            batcher.submit("facebook", "https://facebook.com/a", {"num_of_reviews": 50}),
+            batcher.submit("facebook", "https://facebook.com/a", {"num_of_reviews": 50}),
+            batcher.submit("facebook", "https://facebook.com/a", {"num_of_reviews": 10})
+        )
+
+        entries = client.calls[0][1]
+        assert entries == [
+            {"url": "https://facebook.com/a", "num_of_reviews": 50},
+            {"url": "https://facebook.com/a", "num_of_reviews": 10}
+        ]
+        assert len({result["job_id"] for result in results}) == 1
+
+    run(scenario())
+
+
+def test_trigger_exception_reaches_every_waiter():
+    async def scenario():
+        client = StubClient(error=RuntimeError("BrightData unreachable"))
+        batcher = CrawlBatcher(lambda: client, window=0.02)
+        results = await asyncio.gather(*(
+            batcher.submit("instagram", f"https://instagram.com/{name}") for name in "abc"
+        ))
+
+        assert len(client.calls) == 1
+        assert all(result["status"] == "failed" for result in results)
+        assert all("BrightData unreachable" in result["error"] for result in results)
+
+    run(scenario())
+
+
+def test_trigger_failure_result_reaches_every_waiter():
+    async def scenario():
+        client = StubClient(result={"status": "failed", "error": "HTTP error: 401"})
+        batcher = CrawlBatcher(lambda: client, window=0.02)
+        results = await asyncio.gather(
+            batcher.submit("instagram", "https://instagram.com/a"),
+            batcher.submit("instagram", "https://instagram.com/b")
+        )
+        assert results == [{"status": "failed", "error": "HTTP error: 401"}] * 2
+
+    run(scenario())
+
+
+def test_close_cancels_pending_and_waits_for_in_flight_batches():
+    async def scenario():
+        client = StubClient()
+        client.release = asyncio.Event()
+        batcher = CrawlBatcher(lambda: client, window=0.01, max_batch=1)
+
+        in_flight = asyncio.create_task(batcher.submit("instagram", "https://instagram.com/a"))
+        await asyncio.sleep(0.02)
+        assert len(client.calls) == 1
+
+        batcher.max_batch = 10
+        pending = asyncio.create_task(batcher.submit("facebook", "https://facebook.com/a"))
+        await asyncio.sleep(0)
+
+        closing = asyncio.create_task(batcher.close())
+        await asyncio.sleep(0)
+        assert not closing.done()  # Waits for the in-flight trigger
+        client.release.set()
+        await closing
+
+        assert (await in_flight)["status"] == "job_created"
+        assert pending.cancelled() or isinstance(pending.exception(), asyncio.CancelledError)
+        assert len(client.calls) == 1
+
+    run(scenario())
@@ -0,0 +1,104 @@
+"""
+Tests for json_stream: extracting the assessment object from LLM replies,
+whole or streamed in arbitrary chunks
+"""
+
+import pytest
+
+from json_stream import JsonFieldStream, extract_json_object
+
+ASSESSMENT = (
+    '{"sustainability_index": 72, "environmental_score": 68, '
+    '"recommendations": ["Use {local} suppliers", "Cut \\"single-use\\" cups"], '
+    '"details": {"energy": [1, 2, {"solar": true}]}, "note": "ends with }"}'
+)
+
+EXPECTED = {
+    "sustainability_index": 72,
+    "environmental_score": 68,
+    "recommendations": ["Use {local} suppliers", 'Cut "single-use" cups'],
+    "details": {"energy": [1, 2, {"solar": True}]},
+    "note": "ends with }"
+}
+
+
+def feed_in_chunks(text, size):
+    stream = JsonFieldStream()
+    fields = []
+    for index in range(0, len(text), size):
+        fields.extend(stream.feed(text[index:index + size]))
+    return stream, fields
+
+
+def test_plain_object():
+    assert extract_json_object(ASSESSMENT) == EXPECTED
+
+
+@pytest.mark.parametrize("reply", [
+    "```json\n" + ASSESSMENT + "\n```",
+    "Here is the assessment you asked for:\n\n" + ASSESSMENT + "\n\nLet me know if you need more.",
+    "```\n" + ASSESSMENT + "\n```\nNote: scores are estimates {not exact}.",
+])
+def test_fenced_or_prose_wrapped_reply(reply):
+    assert extract_json_object(reply) == EXPECTED
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    reply = '{"a": "}}}", "b": "{[", "c": 1}'
+    assert extract_json_object(reply) == {"a": "}}}", "b": "{[", "c": 1}
+
+
+def test_trailing_text_with_another_object_is_ignored():
+    reply = ASSESSMENT + ' and an example: {"sustainability_index": 0}'
+    assert extract_json_object(reply) == EXPECTED
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16])
+def test_chunks_split_mid_token(size):
+    stream, fields = feed_in_chunks("Sure! ```json\n" + ASSESSMENT + "\n``` done", size)
+    assert stream.done
+    assert stream.result() == EXPECTED
+    # Every top-level field is reported once, in order, with its final value
+    assert fields == list(EXPECTED.items())
+
+
+def test_fields_are_reported_as_soon_as_complete():
+    stream = JsonFieldStream()
+    assert stream.feed('{"sustainability_index": 7') == []  # Number may still continue
+    assert stream.feed('2, "recommendations": ["a", ') == [("sustainability_index", 72)]
+    assert stream.feed('"b"]') == []
+    assert stream.feed('}') == [("recommendations", ["a", "b"])]
+    assert stream.done
+
+
+def test_escaped_quote_and_backslash_in_strings():
+    reply = r'{"path": "C:\\dir\\", "quote": "say \"hi\" }"}'
+    assert extract_json_object(reply) == {"path": "C:\\dir\\", "quote": 'say "hi" }'}
+
+
+@pytest.mark.parametrize("reply", [
+    "",
+    "I could not produce an assessment.",
+    '{"sustainability_index": 72, "recommendations": ["a"',  # Truncated
+])
+def test_incomplete_reply_raises_value_error(reply):
+    with pytest.raises(ValueError):
+        extract_json_object(reply)
+
+
+@pytest.mark.parametrize("reply", [
+    '{"sustainability_index": 7 2}',
+    '{"sustainability_index": tru}',
+    "{'sustainability_index': 72}",
+])
+def test_malformed_object_raises_value_error(reply):
+    with pytest.raises(ValueError):
+        extract_json_object(reply)
+
+
+def test_result_before_completion_raises():
+    stream = JsonFieldStream()
+    stream.feed('{"a": 1')
+    assert not stream.done
+    with pytest.raises(ValueError):
+        stream.result()
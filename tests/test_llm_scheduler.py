@@ -0,0 +1,195 @@
+"""
+Tests for llm_scheduler.LlmScheduler: admission limits, queue timeout,
+round-robin dispatch, coalescing and slot release on cancellation
+"""
+
+import asyncio
+
+import pytest
+
+from llm_scheduler import LlmBusy, LlmScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def settle():
+    # Let submitted tasks reach their first await
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_per_user_limit_is_429_and_full_queue_is_503():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=1, max_queue=1, max_per_user=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(scheduler.submit("alice", call))
+        await settle()
+
+        with pytest.raises(LlmBusy) as per_user:
+            await scheduler.submit("alice", call)
+        assert per_user.value.status_code == 429
+
+        second = asyncio.create_task(scheduler.submit("bob", call))
+        await settle()
+        with pytest.raises(LlmBusy) as full:
+            await scheduler.submit("carol", call)
+        assert full.value.status_code == 503
+        assert full.value.retry_after >= 1
+
+        release.set()
+        assert await first == "ok"
+        assert await second == "ok"
+        assert scheduler.stats()["rejected"] == 2
+
+    run(scenario())
+
+
+def test_queued_call_times_out_with_503():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=1, max_queue=4, max_per_user=4, queue_timeout=0.05)
+        release = asyncio.Event()
+        ran = []
+
+        async def blocking():
+            await release.wait()
+
+        async def queued():
+            ran.append(True)
+
+        running = asyncio.create_task(scheduler.submit("alice", blocking))
+        await settle()
+
+        with pytest.raises(LlmBusy) as timed_out:
+            await scheduler.submit("bob", queued)
+        assert timed_out.value.status_code == 503
+        assert scheduler.queue_depth == 0
+        assert scheduler.stats()["timed_out"] == 1
+
+        release.set()
+        await running
+        assert ran == []  # Dropped calls never run
+
+    run(scenario())
+
+
+def test_free_slots_go_to_users_round_robin():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=1, max_queue=10, max_per_user=5, queue_timeout=5)
+        release = asyncio.Event()
+        order = []
+
+        async def blocking():
+            await release.wait()
+
+        def recorder(name):
+            async def call():
+                order.append(name)
+            return call
+
+        blocker = asyncio.create_task(scheduler.submit("blocker", blocking))
+        await settle()
+
+        # alice queues a burst before bob and carol submit one call each
+        tasks = [asyncio.create_task(scheduler.submit("alice", recorder(f"alice-{i}"))) for i in range(3)]
+        await settle()
+        tasks.append(asyncio.create_task(scheduler.submit("bob", recorder("bob-0"))))
+        tasks.append(asyncio.create_task(scheduler.submit("carol", recorder("carol-0"))))
+        await settle()
+        assert scheduler.queue_depth == 5
+
+        release.set()
+        await blocker
+        await asyncio.gather(*tasks)
+        assert order == ["alice-0", "bob-0", "carol-0", "alice-1", "alice-2"]
+
+    run(scenario())
+
+
+def test_same_key_calls_share_one_result():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=2, max_queue=4, max_per_user=1, queue_timeout=5)
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(True)
+            await release.wait()
+            return {"index": 71}
+
+        first = asyncio.create_task(scheduler.submit("alice", call, key="prompt"))
+        await settle()
+        # Same user past its limit and another user: both join the running call
+        joined = [asyncio.create_task(scheduler.submit(user, call, key="prompt")) for user in ("alice", "bob")]
+        await settle()
+
+        release.set()
+        results = await asyncio.gather(first, *joined)
+        assert results == [{"index": 71}] * 3
+        assert len(calls) == 1
+        assert scheduler.stats()["coalesced"] == 2
+
+    run(scenario())
+
+
+def test_cancelled_call_releases_its_slot():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=1, max_queue=4, max_per_user=4, queue_timeout=5)
+
+        async def hangs():
+            await asyncio.Event().wait()
+
+        async def quick():
+            return "done"
+
+        running = asyncio.create_task(scheduler.submit("alice", hangs, key="hangs"))
+        await settle()
+        waiting = asyncio.create_task(scheduler.submit("bob", quick))
+        await settle()
+        assert scheduler.stats()["running"] == 1 and scheduler.queue_depth == 1
+
+        # Cancel the call itself (not just a requester): its slot goes to the waiting call
+        scheduler._inflight["hangs"].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert await asyncio.wait_for(waiting, 1) == "done"
+        assert scheduler.stats()["running"] == 0
+        assert scheduler.retry_after() >= 1
+
+        # Per-user and admission accounting are back to zero
+        assert await scheduler.submit("alice", quick) == "done"
+        assert scheduler._admitted == 0 and scheduler._per_user == {}
+
+    run(scenario())
+
+
+def test_cancelled_requester_does_not_cancel_the_call():
+    async def scenario():
+        scheduler = LlmScheduler(max_concurrency=1, max_queue=4, max_per_user=4, queue_timeout=5)
+        release = asyncio.Event()
+        finished = []
+
+        async def call():
+            await release.wait()
+            finished.append(True)
+            return "shared"
+
+        requester = asyncio.create_task(scheduler.submit("alice", call, key="k"))
+        await settle()
+        sharer = asyncio.create_task(scheduler.submit("bob", call, key="k"))
+        await settle()
+
+        requester.cancel()  # e.g. the client disconnected
+        await settle()
+        release.set()
+        assert await sharer == "shared"
+        assert finished == [True]
+        assert scheduler.stats()["running"] == 0
+
+    run(scenario())
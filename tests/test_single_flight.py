@@ -0,0 +1,145 @@
+"""
+Tests for single_flight.CrawlSingleFlight against an in-memory Motor collection
+carrying the brightdata_inflight indexes declared in indexes.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from mongomock_motor import AsyncMongoMockClient
+
+from indexes import INDEXES
+from single_flight import CrawlSingleFlight, crawl_key
+
+URL = "https://www.instagram.com/alpha/"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def inflight_collection():
+    collection = AsyncMongoMockClient()["test"]["brightdata_inflight"]
+    for model in INDEXES["brightdata_inflight"]:
+        spec = dict(model.document)
+        # create_index rather than create_indexes: the mock keeps partialFilterExpression only here
+        await collection.create_index(list(spec.pop("key").items()), **spec)
+    return collection
+
+
+class StubTrigger:
+    """Counts trigger calls and hands out a new job_id per call; optionally blocks until released"""
+
+    def __init__(self, blocked=False):
+        self.calls = 0
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        job_id = f"s_{self.calls}"
+        await self.release.wait()
+        return {"status": "job_created", "job_id": job_id}
+
+
+def test_concurrent_claims_on_the_same_key_trigger_once():
+    async def scenario():
+        single_flight = CrawlSingleFlight(await inflight_collection(), wait_interval=0.01)
+        trigger = StubTrigger()
+        results = await asyncio.gather(*(
+            single_flight.run("instagram", URL, {}, trigger) for _ in range(5)
+        ))
+
+        assert trigger.calls == 1
+        assert {result["job_id"] for result in results} == {"s_1"}
+        assert sum(1 for result in results if result.get("deduplicated")) == 4
+
+    run(scenario())
+
+
+def test_waiter_picks_up_the_owners_job_id():
+    async def scenario():
+        collection = await inflight_collection()
+        single_flight = CrawlSingleFlight(collection, wait_interval=0.01)
+        trigger = StubTrigger(blocked=True)
+
+        owner = asyncio.create_task(single_flight.run("instagram", URL, {}, trigger))
+        await asyncio.sleep(0.02)
+        waiter = asyncio.create_task(single_flight.run("instagram", "https://instagram.com/alpha", {}, trigger))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()  # The claim has no job_id yet
+
+        trigger.release.set()
+        owned, joined = await asyncio.gather(owner, waiter)
+
+        assert trigger.calls == 1
+        assert "deduplicated" not in owned
+        assert joined["deduplicated"] is True
+        assert joined["job_id"] == owned["job_id"] == "s_1"
+        claim = await collection.find_one({"key": crawl_key("instagram", URL, {}), "status": "running"})
+        assert claim["job_id"] == "s_1"
+
+    run(scenario())
+
+
+def test_abandoned_claim_is_taken_over():
+    async def scenario():
+        collection = await inflight_collection()
+        single_flight = CrawlSingleFlight(collection, claim_timeout=30, wait_interval=0.01)
+        long_ago = datetime.now(timezone.utc) - timedelta(minutes=5)
+        # A worker died between claiming and triggering
+        await collection.insert_one({
+            "key": crawl_key("instagram", URL, {}),
+            "status": "running",
+            "job_id": None,
+            "claimed_at": long_ago,
+            "expires_at": long_ago + timedelta(seconds=30)
+        })
+        trigger = StubTrigger()
+
+        result = await asyncio.wait_for(single_flight.run("instagram", URL, {}, trigger), timeout=1)
+
+        assert trigger.calls == 1
+        assert result == {"status": "job_created", "job_id": "s_1"}
+        claims = await collection.find({}).to_list(length=None)
+        assert sorted((claim["status"], claim["job_id"] or "") for claim in claims) == [
+            ("abandoned", ""), ("running", "s_1")
+        ]
+
+    run(scenario())
+
+
+def test_release_lets_the_next_claim_start_a_new_crawl():
+    async def scenario():
+        collection = await inflight_collection()
+        single_flight = CrawlSingleFlight(collection, wait_interval=0.01)
+        trigger = StubTrigger()
+
+        first = await single_flight.run("instagram", URL, {}, trigger)
+        repeated = await single_flight.run("instagram", URL, {}, trigger)
+        assert repeated["deduplicated"] is True and repeated["job_id"] == first["job_id"]
+
+        await single_flight.release(first["job_id"])
+        second = await single_flight.run("instagram", URL, {}, trigger)
+
+        assert trigger.calls == 2
+        assert second == {"status": "job_created", "job_id": "s_2"}
+        released = await collection.find_one({"job_id": "s_1"})
+        assert released["status"] == "done" and released["released_at"] is not None
+
+    run(scenario())
+
+
+def test_failed_trigger_frees_the_claim():
+    async def scenario():
+        collection = await inflight_collection()
+        single_flight = CrawlSingleFlight(collection, wait_interval=0.01)
+
+        async def failing():
+            return {"status": "failed", "error": "HTTP error: 401"}
+
+        assert (await single_flight.run("instagram", URL, {}, failing))["status"] == "failed"
+        assert await collection.count_documents({}) == 0
+
+    run(scenario())
@@ -0,0 +1,145 @@
+"""
+Tests for splitting a batched snapshot back out to the jobs that share it
+(brightdata_integration.parse_snapshot / results_for_url and
+server.store_snapshot_results)
+"""
+
+import asyncio
+
+import server
+from brightdata_integration import SnapshotCollector, group_records_by_url, parse_snapshot, results_for_url
+
+
+def place(url, name, reviews):
+    """Snapshot rows for one input: one row per review, echoing the input"""
+    return [
+        {
+            "input": {"url": url, "days_limit": 30},
+            "name": name,
+            "rating": 4.4,
+            "reviews_count": 120,
+            "review_rating": rating,
+            "review_date": "2026-10-05T10:00:00+00:00"
+        }
+        for rating in reviews
+    ]
+
+
+SNAPSHOT = (
+    place("https://www.google.com/maps/place/Alpha/", "Alpha", [5, 4, 4])
+    + place("https://google.com/maps/place/Beta?utm_source=x", "Beta", [1, 2])
+)
+
+
+def test_records_are_grouped_by_normalized_input_url():
+    groups = group_records_by_url(SNAPSHOT + [{"name": "no echo"}])
+    assert set(groups) == {
+        "https://google.com/maps/place/Alpha",
+        "https://google.com/maps/place/Beta",
+        None
+    }
+    assert len(groups["https://google.com/maps/place/Alpha"]) == 3
+
+
+def test_each_url_gets_its_own_results_and_aggregates():
+    parsed = parse_snapshot("googlemaps", SNAPSHOT)
+
+    alpha = results_for_url(parsed, "googlemaps", "https://google.com/maps/place/Alpha")
+    beta = results_for_url(parsed, "googlemaps", "http://www.google.com/maps/place/Beta/")
+    assert alpha["place_name"] == "Alpha"
+    assert alpha["satisfaction"]["reviews_analyzed"] == 3
+    assert alpha["satisfaction"]["rating_distribution"] == {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1}
+    assert beta["place_name"] == "Beta"
+    assert beta["satisfaction"]["mean_rating"] == 1.5
+
+
+def test_url_missing_from_the_snapshot_gets_the_empty_result():
+    parsed = parse_snapshot("googlemaps", SNAPSHOT)
+    missing = results_for_url(parsed, "googlemaps", "https://google.com/maps/place/Gamma")
+    assert missing == {"reviews_count": 0, "rating": 0, "error": "No data returned"}
+
+
+def test_streamed_reviews_are_folded_without_keeping_the_rows():
+    collector = SnapshotCollector(
+        ["https://google.com/maps/place/Alpha", "https://google.com/maps/place/Beta"],
+        per_url_limit=1,
+        fold_reviews=True
+    )
+    assert not any(collector.feed(record) for record in SNAPSHOT)  # Review snapshots are read to the end
+    assert len(collector.records) == 2
+    assert len(collector.reviews["https://google.com/maps/place/Alpha"]) == 3
+
+    streamed = parse_snapshot("googlemaps", collector.records, collector.reviews)
+    assert streamed == parse_snapshot("googlemaps", SNAPSHOT)
+
+
+def test_snapshot_without_input_echo_serves_any_url():
+    rows = [{"followers_count": 10, "posts_count": 2, "username": "alpha", "url": "u"}]
+    parsed = parse_snapshot("instagram", rows)
+    assert results_for_url(parsed, "instagram", "https://instagram.com/alpha")["followers"] == 10
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield dict(document)
+
+
+class FakeJobs:
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        statuses = query.get("status", {}).get("$in")
+        return FakeCursor([
+            document for document in self.documents
+            if document["job_id"] == query["job_id"] and (statuses is None or document["status"] in statuses)
+        ])
+
+
+class FakeDb:
+    def __init__(self, jobs):
+        self.brightdata_jobs = FakeJobs(jobs)
+
+
+def test_store_snapshot_results_fans_out_per_user_and_url(monkeypatch):
+    jobs = [
+        {"job_id": "s_1", "user_id": "u1", "platform": "googlemaps", "status": "running",
+         "url": "https://www.google.com/maps/place/Alpha"},
+        {"job_id": "s_1", "user_id": "u2", "platform": "googlemaps", "status": "running",
+         "url": "https://google.com/maps/place/Beta/"},
+        {"job_id": "s_1", "user_id": "u3", "platform": "googlemaps", "status": "running",
+         "url": "https://google.com/maps/place/Alpha"},
+        # Already completed by a concurrent path: left alone
+        {"job_id": "s_1", "user_id": "u4", "platform": "googlemaps", "status": "completed",
+         "url": "https://google.com/maps/place/Alpha"}
+    ]
+    stored_jobs = []
+    parse_calls = []
+
+    async def fake_store_job_results(job, parsed_data):
+        stored_jobs.append((job["user_id"], parsed_data.get("place_name")))
+        return job["user_id"] != "u3"  # u3 lost the completion race
+
+    def counting_parse_snapshot(platform, raw_data, reviews=None):
+        parse_calls.append(platform)
+        return parse_snapshot(platform, raw_data, reviews)
+
+    monkeypatch.setattr(server, "db", FakeDb(jobs))
+    monkeypatch.setattr(server, "store_job_results", fake_store_job_results)
+    monkeypatch.setattr(server, "parse_snapshot", counting_parse_snapshot)
+
+    stored = asyncio.run(server.store_snapshot_results("s_1", SNAPSHOT))
+
+    assert stored_jobs == [("u1", "Alpha"), ("u2", "Beta"), ("u3", "Alpha")]
+    assert set(stored) == {"u1", "u2"}
+    assert stored["u2"]["satisfaction"]["reviews_analyzed"] == 2
+    assert parse_calls == ["googlemaps"]  # Parsed once for every job sharing the snapshot
@@ -0,0 +1,125 @@
+"""
+Tests for the BrightData completion webhook, driven end to end through
+tools/fake_notifier.send_notification against the ASGI app
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import server
+from tools.fake_notifier import send_notification
+
+WEBHOOK_URL = "http://testserver/api/brightdata/webhook"
+SECRET = "webhook-secret"
+PROFILE_URL = "https://www.instagram.com/alpha/"
+
+
+class StubBrightDataClient:
+    """Serves one completed instagram snapshot and counts downloads"""
+
+    def __init__(self):
+        self.downloads = []
+
+    async def get_results(self, job_id, platform=None, urls=None, stream=None):
+        self.downloads.append(job_id)
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "data": [{"input": {"url": PROFILE_URL}, "followers_count": 1200, "posts_count": 48, "username": "alpha"}],
+            "reviews": None
+        }
+
+
+@pytest.fixture
+def app_db(monkeypatch):
+    db = AsyncMongoMockClient()["look_at_me"]
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server.display_cache, "collection", db.display_snapshots)
+    monkeypatch.setattr(server.social_cache, "collection", db.social_results_cache)
+    monkeypatch.setattr(server.social_metrics, "points", db.social_metrics)
+    monkeypatch.setattr(server.social_metrics, "rollups", db.social_metrics_rollups)
+    monkeypatch.setattr(server.crawl_single_flight, "collection", db.brightdata_inflight)
+    monkeypatch.setattr(server, "BRIGHTDATA_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(server, "job_poller", None)
+    client = StubBrightDataClient()
+    monkeypatch.setattr(server, "brightdata_client", client)
+
+    async def seed():
+        await db.users.insert_one({"id": "u1", "business_name": "Alpha Cafe"})
+        await db.store_configs.insert_one({"user_id": "u1", "instagram_url": PROFILE_URL})
+        await db.brightdata_jobs.insert_one({
+            "job_id": "s_1", "user_id": "u1", "platform": "instagram", "url": PROFILE_URL, "status": "running"
+        })
+    asyncio.run(seed())
+    return db, client
+
+
+def notify(secret, snapshot_id="s_1", count=1):
+    async def deliver():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            # The ASGI transport returns once the response and its background tasks have run
+            return await asyncio.gather(*(
+                send_notification(WEBHOOK_URL, snapshot_id, secret, client=client) for _ in range(count)
+            ))
+    return asyncio.run(deliver())
+
+
+def job(db):
+    return asyncio.run(db.brightdata_jobs.find_one({"job_id": "s_1"}, {"_id": 0}))
+
+
+@pytest.mark.parametrize("secret", ["", "wrong-secret"])
+def test_missing_or_bad_credentials_are_rejected(app_db, secret):
+    db, client = app_db
+    [response] = notify(secret)
+    assert response.status_code == 401
+    assert client.downloads == []
+    assert job(db)["status"] == "running"
+
+
+def test_valid_notification_completes_the_job_once(app_db):
+    db, client = app_db
+    [response] = notify(SECRET)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "accepted", "job_id": "s_1"}
+    assert client.downloads == ["s_1"]
+    completed = job(db)
+    assert completed["status"] == "completed"
+    assert completed["results"]["followers"] == 1200
+    latest = asyncio.run(db.social_latest.find_one({"user_id": "u1", "platform": "instagram"}))
+    assert latest["job_id"] == "s_1"
+
+
+def test_duplicate_notification_is_a_no_op(app_db):
+    db, client = app_db
+    notify(SECRET)
+    first = job(db)
+
+    [duplicate] = notify(SECRET)
+    assert duplicate.status_code == 200
+    assert duplicate.json() == {"status": "ignored", "job_id": "s_1"}
+    assert client.downloads == ["s_1"]
+    assert job(db) == first
+
+
+def test_concurrent_duplicates_store_the_results_once(app_db, monkeypatch):
+    db, client = app_db
+    stored = []
+    store_job_results = server.store_job_results
+
+    async def counting_store_job_results(job, parsed_data):
+        won = await store_job_results(job, parsed_data)
+        stored.append(won)
+        return won
+
+    monkeypatch.setattr(server, "store_job_results", counting_store_job_results)
+    responses = notify(SECRET, count=3)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert stored.count(True) == 1
+    assert job(db)["status"] == "completed"